@@ -10,7 +10,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['pandas', 'numpy', 'openpyxl'],  # 內建 xlsx 讀寫器，不需要打包 pandas；代價是 exe 沒有 pandas 備援讀取器 (舊版 .xls 要先另存成 .xlsx)
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,606 @@
+"""抽獎看板效能量測工具 (不需要 pywebview，直接呼叫 main.Api)
+
+用法：
+    python bench.py startup [--runs N]    量測冷啟動到第一次 get_data 完成的時間
+    python bench.py group [--sizes ...]   名單分組的微基準 (原版 iterrows 對照目前的欄式處理)
+    python bench.py suite [--sizes ...] [--output FILE]
+                                          產生合成活頁簿，量測 get_data 全程與各階段時間、
+                                          記憶體峰值與 JSON 大小，結果寫成 JSON 檔
+    python bench.py wire [--sizes ...]    比較物件格式與欄式格式的 JSON 大小與解析時間
+    python bench.py soak [--refreshes N] [--output FILE]
+                                          長時間開著的模擬：反覆存檔、重新解析、送差異，記錄常駐記憶體 (RSS)
+    python bench.py compare OLD.json NEW.json
+                                          比較兩次 suite 的結果 (例如不同 commit)
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# 冷啟動量測：每次都開新的 Python 行程，和雙擊 exe 一樣從零開始
+STARTUP_CASES = [
+    ("快速讀取器 (main.Api)",
+     "import main; main.Api().get_data()"),
+    # 第一次執行會寫出快取，之後幾次量到的是讀快取直接回應的時間
+    ("磁碟快取 (main.Api + cache)",
+     "import main, os, tempfile; "
+     "main.Api(cache_path=os.path.join(tempfile.gettempdir(), 'bench_snapshot.cache')).get_data()"),
+    ("pandas read_excel (舊版讀法)",
+     "import pandas as pd, main; p = main.get_excel_path(); "
+     "pd.read_excel(p, sheet_name=main.CONFIG_SHEET); "
+     "pd.read_excel(p, sheet_name=main.WINNER_SHEET)"),
+]
+
+
+def _has_module(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def bench_startup(runs):
+    results = []
+    for label, code in STARTUP_CASES:
+        if "pandas" in code and not _has_module("pandas"):
+            print(f"{label:<32} (略過：未安裝 pandas)")
+            continue
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=HERE, check=True)
+            times.append((time.perf_counter() - start) * 1000)
+        median = statistics.median(times)
+        results.append((label, median))
+        print(f"{label:<32} 中位數 {median:8.1f} ms  (最快 {min(times):.1f} ms, {runs} 次)")
+    return results
+
+
+AWARD_NAMES = ["頭獎", "二獎", "三獎", "四獎", "五獎", "六獎-現金", "普獎", "特別獎"]
+DEPT_NAMES = ["資訊部", "人資部", "財務部", "業務一部", "業務二部", "研發中心", "製造處", "品保課"]
+SURNAMES = "陳林黃張李王吳劉蔡楊許鄭謝郭洪曾邱廖賴周"
+GIVEN = "志明淑芬俊傑怡君家豪雅婷建宏美玲宗翰佳穎冠宇詩涵承恩"
+
+
+def _person(emp_no):
+    # 同一個工號永遠對到同一個姓名與單位，名冊與名單才會一致
+    rng = random.Random(emp_no)
+    return rng.choice(SURNAMES) + rng.choice(GIVEN) + rng.choice(GIVEN), rng.choice(DEPT_NAMES)
+
+
+def make_winner_rows(count, award_count=6, seed=0, id_only=0.0):
+    """產生與 read_workbook 輸出相同形狀的名單列 (含表頭)
+
+    工號混合字串、整數與帶 .0 的浮點數，約 2% 重複、1% 姓名空白；
+    id_only 比例的列只填工號 (姓名、單位留白，交給人員名冊帶出)。
+    """
+    rng = random.Random(seed)
+    awards = AWARD_NAMES[:award_count] + [f"加碼獎{i}" for i in range(award_count - len(AWARD_NAMES))]
+    rows = [["序號", "獎項", "金額", "工號", "姓名", "單位"]]
+    for i in range(count):
+        emp_no = rng.randint(1, count * 50) if rng.random() < 0.02 else 100000 + i
+        emp_id = rng.choice([str(emp_no).zfill(6), emp_no, float(emp_no)])
+        name, dept = _person(emp_no)
+        if rng.random() < 0.01:
+            name = None
+        if rng.random() < id_only:
+            name = dept = None
+        rows.append([i + 1, awards[i * len(awards) // count], 2000, emp_id, name, dept])
+    return rows
+
+
+def make_directory_rows(count):
+    rows = [["員工編號", "單位名稱", "中文姓名"]]
+    for i in range(count):
+        name, dept = _person(100000 + i)
+        rows.append([str(100000 + i), dept, name])
+    return rows
+
+
+def make_config_rows():
+    return [
+        ["A (設定項目)", "B (設定值)", "C (說明 - 選填)"],
+        ["活動標題", "2026 尾牙摸彩", "顯示在大螢幕最上方的標題"],
+        ["活動副標題", "馬到成功・開運大吉", "修改副標題"],
+        ["滾動速度", 1.5, "數字越大滾越快"],
+        ["更新頻率", 5, "幾秒鐘讀取一次檔案"],
+    ]
+
+
+def _sheet_xml(rows, strings):
+    out = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+           '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>']
+    for r, row in enumerate(rows, 1):
+        out.append(f'<row r="{r}">')
+        for c, value in enumerate(row):
+            if value is None:
+                continue
+            ref = (chr(65 + c) if c < 26 else "A" + chr(65 + c - 26)) + str(r)
+            if isinstance(value, str):
+                idx = strings.setdefault(value, len(strings))
+                out.append(f'<c r="{ref}" t="s"><v>{idx}</v></c>')
+            else:
+                out.append(f'<c r="{ref}"><v>{value!r}</v></c>')
+        out.append('</row>')
+    out.append('</sheetData></worksheet>')
+    return ''.join(out)
+
+
+def write_workbook(path, sheets):
+    """把 {工作表名稱: rows} 寫成最小但合法的 xlsx (共用字串表 + 一份充數的 styles.xml)"""
+    strings = {}
+    bodies = [(name, _sheet_xml(rows, strings)) for name, rows in sheets.items()]
+    sst = ''.join(f'<si><t xml:space="preserve">{escape(text)}</t></si>' for text in strings)
+    ns = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml",
+                    '<?xml version="1.0" encoding="UTF-8"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                    '<Default Extension="xml" ContentType="application/xml"/>'
+                    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                    + ''.join(f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                              for i in range(1, len(bodies) + 1)) +
+                    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+                    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                    '</Types>')
+        zf.writestr("_rels/.rels",
+                    f'<?xml version="1.0" encoding="UTF-8"?><Relationships {ns}>'
+                    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+                    '</Relationships>')
+        zf.writestr("xl/workbook.xml",
+                    '<?xml version="1.0" encoding="UTF-8"?><workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+                    + ''.join(f'<sheet name="{escape(name)}" sheetId="{i}" r:id="rId{i}"/>' for i, (name, _) in enumerate(bodies, 1)) +
+                    '</sheets></workbook>')
+        rels = ''.join(f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                       f'Target="worksheets/sheet{i}.xml"/>' for i in range(1, len(bodies) + 1))
+        n = len(bodies)
+        zf.writestr("xl/_rels/workbook.xml.rels",
+                    f'<?xml version="1.0" encoding="UTF-8"?><Relationships {ns}>{rels}'
+                    f'<Relationship Id="rId{n + 1}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+                    f'<Relationship Id="rId{n + 2}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+                    '</Relationships>')
+        for i, (_, body) in enumerate(bodies, 1):
+            zf.writestr(f"xl/worksheets/sheet{i}.xml", body)
+        zf.writestr("xl/sharedStrings.xml",
+                    '<?xml version="1.0" encoding="UTF-8"?><sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                    f'count="{len(strings)}" uniqueCount="{len(strings)}">{sst}</sst>')
+        # 真實檔案的 styles.xml 約 20 KB，讀取器應該完全不碰它
+        fonts = ''.join(f'<font><sz val="{10 + i % 8}"/><name val="Arial"/></font>' for i in range(400))
+        zf.writestr("xl/styles.xml",
+                    '<?xml version="1.0" encoding="UTF-8"?><styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                    f'<fonts count="400">{fonts}</fonts></styleSheet>')
+
+
+def make_workbook(path, winners, award_count=6, directory=20000, seed=0):
+    """產生一份結構與 抽獎名單與設定.xlsx 相同的合成活頁簿"""
+    import main as board
+
+    write_workbook(path, {
+        board.WINNER_SHEET: make_winner_rows(winners, award_count, seed, id_only=0.1),
+        board.CONFIG_SHEET: make_config_rows(),
+        board.DIRECTORY_SHEET: make_directory_rows(max(directory, winners)),
+    })
+
+
+def _group_iterrows(rows, col_award, col_name, col_dept, col_id):
+    """原版 get_data 的 pandas 處理流程 (drop_duplicates + iterrows)，僅供對照"""
+    import pandas as pd
+
+    df = pd.DataFrame(rows[1:], columns=rows[0])
+    df[col_id] = [str(v) if v is not None else v for v in df[col_id]]
+    start = time.perf_counter()
+
+    df.columns = df.columns.str.strip()
+    if col_id in df.columns:
+        df = df.drop_duplicates(subset=[col_id], keep='first')
+    df = df.dropna(subset=[col_name])
+    df = df[df[col_name].astype(str).str.strip() != '']
+
+    result = {}
+    for _, row in df.iterrows():
+        award = str(row[col_award]).strip()
+        name = str(row[col_name]).strip()
+        dept = str(row[col_dept]).strip() if col_dept in df.columns else ""
+        emp_id = str(row[col_id] if col_id in df.columns else "").strip()
+        if emp_id.lower() == 'nan': emp_id = ''
+        if emp_id.endswith('.0'): emp_id = emp_id[:-2]
+        if award not in result:
+            result[award] = []
+        result[award].append({"name": name, "dept": dept, "empId": emp_id})
+    return {"data": result}, time.perf_counter() - start
+
+
+def _best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return value, best
+
+
+def bench_group(sizes, repeat):
+    import main as board
+
+    cols = ("獎項", "姓名", "單位", "工號")
+    has_pandas = _has_module("pandas")
+    results = []
+    for size in sizes:
+        rows = make_winner_rows(size)
+        new, t_new = _best_of(lambda: board.group_winners(rows, *cols), repeat)
+        line = f"{size:>7} 列  欄式 {t_new * 1000:9.2f} ms"
+        entry = {"rows": size, "columnar_ms": t_new * 1000}
+        if has_pandas:
+            # iterrows 版本只計分組階段，不含建立 DataFrame
+            old, t_old = None, None
+            for _ in range(repeat):
+                value, elapsed = _group_iterrows(rows, *cols)
+                if t_old is None or elapsed < t_old:
+                    old, t_old = value, elapsed
+            same = json.dumps(old["data"]) == json.dumps({a: board.winner_objects(w) for a, w in new["data"].items()})
+            line += f"  iterrows {t_old * 1000:9.2f} ms  加速 {t_old / t_new:6.1f}x  輸出{'一致' if same else '不一致!'}"
+            entry.update(iterrows_ms=t_old * 1000, identical=same)
+        print(line)
+        results.append(entry)
+    return results
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time_stages(board, path):
+    """依 parse_workbook 的順序分別計時各階段 (秒)"""
+    stages = {}
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        raw = f.read()
+    stages["read_file"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sheets = board.read_workbook(raw, [board.CONFIG_SHEET, board.WINNER_SHEET, 0, board.DIRECTORY_SHEET])
+    stages["read_workbook"] = time.perf_counter() - start
+
+    cfg = board.DEFAULT_CONFIG
+    start = time.perf_counter()
+    directory = board.build_directory(sheets.get(board.DIRECTORY_SHEET),
+                                      cfg["dir_col_id"], cfg["dir_col_name"], cfg["dir_col_dept"])
+    stages["build_directory"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = board.group_winners(sheets[board.WINNER_SHEET], cfg["col_award"], cfg["col_name"],
+                                 cfg["col_dept"], cfg["col_id"], directory)
+    stages["group_winners"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    json.dumps({"status": "success", "columns": board.encode_columns(result["data"])})
+    stages["json_dumps"] = time.perf_counter() - start
+    return stages
+
+
+# 在 node 裡量 JSON.parse (+ 欄式解碼) 的時間，比 Python 的 json.loads 更接近畫面端
+_NODE_PARSE = r"""
+const fs = require('fs');
+const [objectsPath, columnsPath, repeat] = process.argv.slice(1);
+function best(fn) {
+    let t = Infinity;
+    for (let i = 0; i < Number(repeat); i++) {
+        const start = process.hrtime.bigint();
+        fn();
+        t = Math.min(t, Number(process.hrtime.bigint() - start) / 1e6);
+    }
+    return t;
+}
+const objects = fs.readFileSync(objectsPath, 'utf8');
+const columns = fs.readFileSync(columnsPath, 'utf8');
+console.log(JSON.stringify({ objects: best(() => JSON.parse(objects)), columns: best(() => JSON.parse(columns)) }));
+"""
+
+
+def bench_wire(sizes, award_count, repeat):
+    import main as board
+
+    cols = ("獎項", "姓名", "單位", "工號")
+    node = shutil.which("node")
+    results = []
+    for size in sizes:
+        data = board.group_winners(make_winner_rows(size, award_count), *cols)["data"]
+        objects = json.dumps({"status": "success", "data": {a: board.winner_objects(w) for a, w in data.items()}})
+        columns = json.dumps({"status": "success", "columns": board.encode_columns(data)})
+        _, t_objects = _best_of(lambda: json.loads(objects), repeat)
+        _, t_columns = _best_of(lambda: json.loads(columns), repeat)
+        entry = {
+            "winners": size,
+            "objects_bytes": len(objects.encode("utf-8")),
+            "columns_bytes": len(columns.encode("utf-8")),
+            "objects_loads_ms": t_objects * 1000,
+            "columns_loads_ms": t_columns * 1000,
+        }
+        line = (f"{size:>7} 位  物件 {entry['objects_bytes'] / 1024:8.1f} KB  欄式 {entry['columns_bytes'] / 1024:8.1f} KB"
+                f"  ({entry['columns_bytes'] / entry['objects_bytes'] * 100:4.0f}%)"
+                f"  json.loads {t_objects * 1000:7.1f} -> {t_columns * 1000:7.1f} ms")
+        if node:
+            with tempfile.TemporaryDirectory() as tmp:
+                paths = [os.path.join(tmp, "objects.json"), os.path.join(tmp, "columns.json")]
+                for path, text in zip(paths, (objects, columns)):
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(text)
+                out = subprocess.run([node, "-e", _NODE_PARSE, *paths, str(repeat)],
+                                     capture_output=True, text=True, check=True).stdout
+            parsed = json.loads(out)
+            entry.update(objects_parse_ms=parsed["objects"], columns_parse_ms=parsed["columns"])
+            line += f"  JSON.parse {parsed['objects']:7.1f} -> {parsed['columns']:7.1f} ms"
+        print(line)
+        results.append(entry)
+    return results
+
+
+def bench_suite(sizes, award_count, directory, repeat, output):
+    import main as board
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"bench_{size}.xlsx")
+            make_workbook(path, size, award_count, directory)
+
+            # 全程：每次都用新的 Api，確保真的重新解析 (不吃變更快取)
+            timings = []
+            for _ in range(repeat):
+                api = board.Api(path)
+                start = time.perf_counter()
+                response = api.get_data()
+                timings.append(time.perf_counter() - start)
+                if len(timings) < repeat:
+                    api.close()
+            if '"error"' in response[:20]:
+                raise SystemExit(f"get_data 失敗：{response}")
+
+            # 快取命中：檔案沒變時的輪詢成本
+            start = time.perf_counter()
+            api.get_data(api.version)
+            cached = time.perf_counter() - start
+            api.close()
+
+            stage_runs = [_time_stages(board, path) for _ in range(repeat)]
+            stages = {k: min(run[k] for run in stage_runs) * 1000 for k in stage_runs[0]}
+
+            # 記憶體峰值另外量 (tracemalloc 本身會拖慢速度)
+            tracemalloc.start()
+            api = board.Api(path)
+            api.get_data()
+            api.close()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            entry = {
+                "winners": size,
+                "awards": award_count,
+                "directory": max(directory, size),
+                "file_bytes": os.path.getsize(path),
+                "get_data_ms": min(timings) * 1000,
+                "get_data_median_ms": statistics.median(timings) * 1000,
+                "not_modified_ms": cached * 1000,
+                "stages_ms": stages,
+                "peak_memory_bytes": peak,
+                "payload_bytes": len(response.encode("utf-8")),
+            }
+            results.append(entry)
+            print(f"{size:>7} 位  get_data {entry['get_data_ms']:9.1f} ms  "
+                  f"峰值記憶體 {peak / 1048576:7.1f} MB  JSON {entry['payload_bytes'] / 1024:8.1f} KB")
+            print("          " + "  ".join(f"{k} {v:.1f}" for k, v in stages.items()))
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"結果已寫入 {output}")
+    return report
+
+
+def _rss_bytes():
+    """目前的常駐記憶體；Linux 直接讀 /proc，其他平台要有 psutil 才量得到"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def bench_soak(refreshes, winners, directory, samples, output):
+    """每一輪都換上一位新的得獎者，所以每一輪都是新的版本，名單大小則維持不變：
+    偶數輪把活頁簿最後一列換成新的人並清空抽獎紀錄檔 (完整重新解析)，奇數輪在紀錄檔追加一行
+    (只讀新增的行)。經由背景執行緒與 get_data 走一遍和畫面相同的流程 (解析 -> 搜尋索引 -> 差異)，
+    並定期記錄 RSS。暖機之後 RSS 應該持平，不隨更新次數成長。"""
+    import main as board
+
+    if _rss_bytes() is None:
+        raise SystemExit("這個平台量不到 RSS (請安裝 psutil)")
+    rows = make_winner_rows(winners, seed=0, id_only=0.1)
+    extra = {board.CONFIG_SHEET: make_config_rows(), board.DIRECTORY_SHEET: make_directory_rows(max(directory, winners))}
+    trace = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "board.xlsx")
+        journal = os.path.join(tmp, "journal.jsonl")
+
+        def save_workbook(i):
+            name, dept = _person(800000 + i)
+            last = rows[-1][:3] + [str(800000 + i), name, dept]
+            # 先寫到暫存檔再換上，背景執行緒不會讀到寫到一半的檔案
+            write_workbook(path + ".tmp", dict(extra, **{board.WINNER_SHEET: rows[:-1] + [last]}))
+            os.replace(path + ".tmp", path)
+
+        save_workbook(-1)
+        api = board.Api(path, journal_path=journal)
+        updated = threading.Event()
+        api.listeners.append(updated.set)
+        version = json.loads(api.get_data())["version"]
+        every = max(1, refreshes // samples)
+        start = time.perf_counter()
+        try:
+            for i in range(refreshes + 1):
+                updated.clear()
+                if i % 2 == 0:
+                    open(journal, "w").close()
+                    save_workbook(i)
+                else:
+                    name, dept = _person(900000 + i)
+                    with open(journal, "a", encoding="utf-8") as f:
+                        f.write(f"{AWARD_NAMES[i % len(AWARD_NAMES)]},J{i:07d},{name},{dept}\n")
+                # 和畫面輪詢一樣：get_data 發現檔案變了就叫醒背景執行緒，換上新快照後再取一次差異
+                api.get_data(version)
+                if not updated.wait(30) or api.last_error is not None:
+                    raise SystemExit(f"第 {i} 次更新失敗：{api.last_error}")
+                response = json.loads(api.get_data(version))
+                if response.get("status") != "delta":
+                    raise SystemExit(f"第 {i} 次更新沒有產生新版本：{response.get('status')}")
+                version = response["version"]
+                api.search("陳")
+                if i % every == 0:
+                    trace.append((i, _rss_bytes()))
+                    print(f"{i:>7} 次  RSS {trace[-1][1] / 1048576:8.1f} MB", flush=True)
+        finally:
+            api.close()
+        elapsed = time.perf_counter() - start
+
+    # 前 10% 當暖機 (索引、快照歷史填滿)，之後的成長才算
+    warm = trace[max(1, len(trace) // 10)][1]
+    final = trace[-1][1]
+    entry = {
+        "winners": winners,
+        "refreshes": refreshes,
+        "refresh_ms": elapsed / (refreshes + 1) * 1000,
+        "rss_warm_bytes": warm,
+        "rss_final_bytes": final,
+        "rss_growth_bytes": final - warm,
+        "rss_trace": trace,
+    }
+    print(f"暖機後 {warm / 1048576:.1f} MB -> 結束 {final / 1048576:.1f} MB  "
+          f"({(final - warm) / 1048576:+.1f} MB，平均每輪 {entry['refresh_ms']:.1f} ms，含寫檔)")
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": [entry],
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"結果已寫入 {output}")
+    return report
+
+
+def _flatten(entry, prefix=""):
+    for key, value in entry.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, prefix + key + ".")
+        elif isinstance(value, (int, float)) and (key.endswith(("_ms", "_bytes")) or prefix):
+            yield prefix + key, value
+
+
+def bench_compare(old_path, new_path):
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"{old.get('commit')} -> {new.get('commit')}")
+    old_by_size = {r["winners"]: r for r in old["results"]}
+    for entry in new["results"]:
+        base = old_by_size.get(entry["winners"])
+        if base is None:
+            continue
+        print(f"{entry['winners']} 位")
+        base_metrics = dict(_flatten(base))
+        for key, value in _flatten(entry):
+            before = base_metrics.get(key)
+            if not before:
+                continue
+            change = (value - before) / before * 100
+            flag = "  <-- 變慢/變大" if change > 10 else ""
+            print(f"  {key:<32} {before:12.1f} -> {value:12.1f}  {change:+6.1f}%{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="抽獎看板效能量測")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_startup = sub.add_parser("startup", help="冷啟動時間")
+    p_startup.add_argument("--runs", type=int, default=5)
+
+    p_group = sub.add_parser("group", help="名單分組微基準")
+    p_group.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    p_group.add_argument("--repeat", type=int, default=3)
+
+    p_suite = sub.add_parser("suite", help="合成活頁簿的完整量測")
+    p_suite.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    p_suite.add_argument("--awards", type=int, default=6)
+    p_suite.add_argument("--directory", type=int, default=20000, help="人員名冊筆數 (至少等於得獎人數)")
+    p_suite.add_argument("--repeat", type=int, default=3)
+    p_suite.add_argument("--output", default="bench_results.json")
+
+    p_wire = sub.add_parser("wire", help="傳輸格式大小與解析時間")
+    p_wire.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000])
+    p_wire.add_argument("--awards", type=int, default=6)
+    p_wire.add_argument("--repeat", type=int, default=5)
+
+    p_soak = sub.add_parser("soak", help="長時間更新的常駐記憶體")
+    p_soak.add_argument("--refreshes", type=int, default=2000)
+    p_soak.add_argument("--winners", type=int, default=1000)
+    p_soak.add_argument("--directory", type=int, default=2000)
+    p_soak.add_argument("--samples", type=int, default=20, help="記錄幾次 RSS")
+    p_soak.add_argument("--output", default="bench_results_soak.json")
+
+    p_compare = sub.add_parser("compare", help="比較兩份 suite 或 soak 結果")
+    p_compare.add_argument("old")
+    p_compare.add_argument("new")
+
+    args = parser.parse_args()
+    if args.command == "startup":
+        bench_startup(args.runs)
+    elif args.command == "group":
+        bench_group(args.sizes, args.repeat)
+    elif args.command == "suite":
+        bench_suite(args.sizes, args.awards, args.directory, args.repeat, args.output)
+    elif args.command == "wire":
+        bench_wire(args.sizes, args.awards, args.repeat)
+    elif args.command == "soak":
+        bench_soak(args.refreshes, args.winners, args.directory, args.samples, args.output)
+    elif args.command == "compare":
+        bench_compare(args.old, args.new)
+
+
+if __name__ == "__main__":
+    main()
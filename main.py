@@ -1,8 +1,22 @@
-import webview
-import pandas as pd
 import json
 import os
 import sys
+import io
+import hashlib
+import threading
+import time
+import select
+import struct
+import csv
+import zlib
+import bisect
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from itertools import chain, compress
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+import re
 
 # --- 預設設定 ---
 DEFAULT_CONFIG = {
@@ -10,106 +24,1905 @@ DEFAULT_CONFIG = {
     "subtitle": "得獎名單", 
     "refresh_rate": 5000,
     "scroll_speed": 1.5,
+    "update_mode": "push",
+    "virtual_threshold": 2000,
+    "wire_format": "columnar",
+    "quality": "auto",
+    "frame_budget": 0,
     "col_award": "獎項",
     "col_name": "姓名",
     "col_dept": "單位",
-    "col_id": "工號"
+    "col_id": "工號",
+    "dir_col_id": "員工編號",
+    "dir_col_name": "中文姓名",
+    "dir_col_dept": "單位名稱"
 }
 
+# 系統設定「畫質」：自動依畫格時間調整，或固定在某一級 (0 全開 ~ 3 最省)
+QUALITY_LEVELS = {"自動": "auto", "auto": "auto", "高": 0, "中": 1, "低": 2, "最低": 3,
+                  "0": 0, "1": 1, "2": 2, "3": 3}
+
 EXCEL_FILENAME = '抽獎名單與設定.xlsx'
+CACHE_FILENAME = '抽獎名單快取.cache'
+JOURNAL_FILENAME = '抽獎紀錄.jsonl'
+CONFIG_SHEET = '系統設定'
+WINNER_SHEET = '得獎名單'
+DIRECTORY_SHEET = '人員名單資料庫'
+
+def get_app_dir():
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+def get_excel_path():
+    return os.path.join(get_app_dir(), EXCEL_FILENAME)
+
+def get_cache_path():
+    return os.path.join(get_app_dir(), CACHE_FILENAME)
+
+def get_journal_path():
+    return os.path.join(get_app_dir(), JOURNAL_FILENAME)
+
+def _stat_key(path):
+    """(mtime, size)；檔案不存在或沒有設定路徑時為 None"""
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# --- 單次讀取的 xlsx 載入器 ---
+# 每次更新只開一次 zip、只解析一次共用字串表，並且只串流需要的工作表；
+# styles.xml、calcChain.xml 與用不到的工作表完全不碰。
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
 
-class Api:
-    def get_data(self):
-        if getattr(sys, 'frozen', False):
-            app_path = os.path.dirname(sys.executable)
+def _zip_target(base_dir, target):
+    if target.startswith('/'):
+        return target[1:]
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+def _list_sheets(zf):
+    """依活頁簿順序回傳 [(工作表名稱, zip 內路徑)]"""
+    rels = {}
+    root = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    for rel in root.iter(_NS_PKG_REL + 'Relationship'):
+        rels[rel.get('Id')] = _zip_target('xl', rel.get('Target'))
+
+    sheets = []
+    root = ET.fromstring(zf.read('xl/workbook.xml'))
+    for sheet in root.iter(_NS_MAIN + 'sheet'):
+        path = rels.get(sheet.get(_NS_REL + 'id'))
+        if path:
+            sheets.append((sheet.get('name'), path))
+    return sheets
+
+def _read_shared_strings(zf):
+    try:
+        f = zf.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+
+    strings = []
+    with f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag != _NS_MAIN + 'si':
+                continue
+            # 只取本文 <t>，跳過注音 <rPh> 裡的文字
+            parts = [elem.findtext(_NS_MAIN + 't') or '']
+            for run in elem.iterfind(_NS_MAIN + 'r'):
+                parts.append(run.findtext(_NS_MAIN + 't') or '')
+            strings.append(''.join(parts))
+            elem.clear()
+    return strings
+
+def _shared_strings_digest(shared, indices):
+    """工作表用到的那些共用字串的雜湊；字串表變短 (索引超出範圍) 時回傳 None"""
+    try:
+        text = '\x00'.join([shared[i] for i in indices])
+    except IndexError:
+        return None
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def _column_index(ref):
+    idx = 0
+    for ch in ref:
+        if 'A' <= ch <= 'Z':
+            idx = idx * 26 + (ord(ch) - 64)
         else:
-            app_path = os.path.dirname(os.path.abspath(__file__))
-            
-        file_path = os.path.join(app_path, EXCEL_FILENAME)
+            break
+    return idx - 1
+
+# pandas.read_excel 預設當作空白的字串 (pandas 的 STR_NA_VALUES)
+_NA_STRINGS = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+                         '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'])
+
+def _cell_value(cell, shared, used=None):
+    t = cell.get('t', 'n')
+    if t == 'e':
+        # 錯誤值 (#REF!、#DIV/0! ...) 與 pandas 相同當作空白
+        return None
+    if t == 'inlineStr':
+        node = cell.find(_NS_MAIN + 'is')
+        value = ''.join(x.text or '' for x in node.iter(_NS_MAIN + 't')) if node is not None else ''
+    else:
+        value = cell.findtext(_NS_MAIN + 'v')
+        if not value:
+            # 沒有快取值的公式 (例如由其他程式存檔) 也當作空白
+            return None
+        if t == 's':
+            i = int(value)
+            if used is not None:
+                used.add(i)
+            value = shared[i]
+        elif t == 'b':
+            return value == '1'
+        elif t == 'n':
+            if '.' in value or 'E' in value or 'e' in value:
+                # 與 pandas 相同：整數值的浮點數 (例如 25.0) 轉成 int
+                number = float(value)
+                return int(number) if number.is_integer() else number
+            return int(value)
+
+    # 與 pandas 相同：空字串、#N/A (例如查不到的 VLOOKUP)、N/A、NULL 等當作空白
+    if value in _NA_STRINGS:
+        return None
+    return value
+
+def _read_sheet_rows(zf, path, shared, used=None):
+    """串流讀取一張工作表，回傳以列為單位的 list (缺少的列補空 list)
+
+    有傳入 used (set) 時，會把這張工作表引用到的共用字串索引加進去。
+    """
+    rows = []
+    row_tag = _NS_MAIN + 'row'
+    cell_tag = _NS_MAIN + 'c'
+    with zf.open(path) as f:
+        for _, elem in ET.iterparse(f):
+            if elem.tag != row_tag:
+                continue
+            r = elem.get('r')
+            if r is not None:
+                while len(rows) < int(r) - 1:
+                    rows.append([])
+            values = []
+            for cell in elem.iterfind(cell_tag):
+                ref = cell.get('r')
+                if ref is not None:
+                    col = _column_index(ref)
+                    while len(values) < col:
+                        values.append(None)
+                values.append(_cell_value(cell, shared, used))
+            while values and values[-1] is None:
+                values.pop()
+            rows.append(values)
+            elem.clear()
+
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+SHEET_UNCHANGED = object()
+
+def read_workbook(raw, sheet_names, signatures=None):
+    """開啟活頁簿一次，讀出指定工作表的所有列。
+
+    回傳 {工作表名稱: rows}；找不到的工作表不會出現在結果中。
+    若要求的名單工作表不存在，會以第一張工作表代替 (鍵值為 0)。
+
+    signatures 是呼叫端上次記下的 {工作表名稱: 簽章}，只有列在裡面的工作表才比對與記錄簽章 (值可為 None)。
+    簽章是工作表在 zip 內的 CRC 與大小，加上它引用的共用字串索引與那些字串的雜湊；
+    共用字串表只有其他工作表用到的部分變了 (例如新增得獎者) 不算變更。
+    簽章沒變的工作表不解析，結果以 SHEET_UNCHANGED 表示。新的簽章會寫回此 dict。
+    """
+    with zipfile.ZipFile(io.BytesIO(raw)) as zf:
+        sheets = _list_sheets(zf)
+        paths = dict(sheets)
+        shared = None
+        result = {}
+        parsed = {}
+        for name in sheet_names:
+            if name == 0:
+                if not sheets:
+                    continue
+                path = sheets[0][1]
+            elif name in paths:
+                path = paths[name]
+            else:
+                continue
+            used = None
+            if signatures is not None and name in signatures:
+                info = zf.getinfo(path)
+                old = signatures[name]
+                if old is not None and old[:2] == (info.CRC, info.file_size):
+                    # 工作表本身沒變，只要再確認它用到的共用字串沒變
+                    if shared is None:
+                        shared = _read_shared_strings(zf)
+                    if _shared_strings_digest(shared, old[3]) == old[2]:
+                        result[name] = SHEET_UNCHANGED
+                        continue
+                used = set()
+            elif path in parsed:
+                # 例如名單工作表同時以名稱和 0 要求時，只解析一次
+                result[name] = parsed[path]
+                continue
+            if shared is None:
+                shared = _read_shared_strings(zf)
+            result[name] = parsed[path] = _read_sheet_rows(zf, path, shared, used)
+            if used is not None:
+                indices = array('I', sorted(used))
+                signatures[name] = (info.CRC, info.file_size, _shared_strings_digest(shared, indices), indices)
+        return result
+
+def read_workbook_pandas(raw, sheet_names):
+    """備援讀取器：快速讀取器處理不了的檔案 (例如舊版 .xls) 才延遲載入 pandas"""
+    try:
+        import pandas as pd
+    except ImportError:
+        # 打包的 exe 不含 pandas (見 LuckyDraw.spec)，這個備援只有用 Python 執行時才有
+        raise ValueError("無法讀取這個檔案，請在 Excel 另存成 .xlsx 格式")
+
+    book = pd.read_excel(io.BytesIO(raw), sheet_name=None, header=None, dtype=object)
+    names = list(book)
+    result = {}
+    for name in sheet_names:
+        key = names[0] if name == 0 and names else name
+        if key not in book:
+            continue
+        rows = []
+        for values in book[key].itertuples(index=False):
+            row = [None if pd.isna(v) else v for v in values]
+            while row and row[-1] is None:
+                row.pop()
+            rows.append(row)
+        result[name] = rows
+    return result
+
+# --- 匯出用的 xlsx 寫入器 ---
+# 只改寫一張工作表 XML 裡需要的儲存格，其餘 zip 項目 (樣式、其他工作表、公式) 原樣複製，不需要 openpyxl。
+def _column_letters(col):
+    letters = ''
+    col += 1
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _cell_xml(ref, value, p, attrs=''):
+    # p 是工作表用的命名空間前綴 (通常沒有)；attrs 是原本儲存格要保留的樣式 s
+    if isinstance(value, bool):
+        return f'<{p}c r="{ref}"{attrs} t="b"><{p}v>{int(value)}</{p}v></{p}c>'
+    if isinstance(value, (int, float)):
+        return f'<{p}c r="{ref}"{attrs}><{p}v>{value!r}</{p}v></{p}c>'
+    # 只跳脫 XML 必要的三個字元 (xml.sax.saxutils 會連帶載入 urllib.request，拖慢啟動)
+    text = str(value).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return f'<{p}c r="{ref}"{attrs} t="inlineStr"><{p}is><{p}t xml:space="preserve">{text}</{p}t></{p}is></{p}c>'
+
+def _patch_row(number, attrs, body, values, p):
+    """改寫一列：values 是 {欄位索引: 值}；原有儲存格依欄位排序保留，全部補上明確的 r"""
+    cells = {}
+    col = -1
+    for m in re.finditer(rf'<{p}c\b([^>]*?)(/>|>.*?</{p}c>)', body or '', re.S):
+        ref = re.search(r'\br="([A-Z]+)\d*"', m.group(1))
+        col = _column_index(ref.group(1)) if ref else col + 1
+        rest = re.sub(r'\s(?:r|t)="[^"]*"', '', m.group(1))
+        letters = _column_letters(col)
+        if col in values:
+            style = re.search(r'\ss="[^"]*"', rest)
+            cells[col] = _cell_xml(f'{letters}{number}', values[col], p, style.group(0) if style else '')
+        else:
+            t = re.search(r'\st="[^"]*"', m.group(1))
+            cells[col] = f'<{p}c r="{letters}{number}"{rest}{t.group(0) if t else ""}{m.group(2)}'
+    for col, value in values.items():
+        if col not in cells:
+            cells[col] = _cell_xml(f'{_column_letters(col)}{number}', value, p)
+    # spans 只是提示，欄位範圍可能變了就拿掉
+    attrs = re.sub(r'\s(?:r|spans)="[^"]*"', '', attrs or '')
+    return f'<{p}row r="{number}"{attrs}>' + ''.join(cells[c] for c in sorted(cells)) + f'</{p}row>'
+
+def _patch_sheet(xml, values):
+    """values 是 {列索引: {欄位索引: 值}} (都從 0 起算)；回傳改好的工作表 XML"""
+    head = re.search(r'<(\w+:)?sheetData\b[^>]*?(/?)>', xml)
+    p = head.group(1) or ''
+    if head.group(2):
+        # 空白工作表：<sheetData/>
+        xml = xml[:head.start()] + f'<{p}sheetData></{p}sheetData>' + xml[head.end():]
+        start = end = head.start() + len(f'<{p}sheetData>')
+    else:
+        start = head.end()
+        end = xml.index(f'</{p}sheetData>', start)
+
+    rows = []
+    number = 0
+    for m in re.finditer(rf'<{p}row\b([^>]*?)(?:/>|>(.*?)</{p}row>)', xml[start:end], re.S):
+        r = re.search(r'\br="(\d+)"', m.group(1))
+        number = int(r.group(1)) if r else number + 1
+        row = values.get(number - 1)
+        rows.append((number, m.group(0) if row is None else _patch_row(number, m.group(1), m.group(2), row, p)))
+    existing = {number for number, _ in rows}
+    for i, row in values.items():
+        if i + 1 not in existing:
+            rows.append((i + 1, _patch_row(i + 1, '', '', row, p)))
+    rows.sort(key=lambda item: item[0])
+    xml = xml[:start] + ''.join(text for _, text in rows) + xml[end:]
+
+    # 使用範圍 (dimension) 跟著擴大
+    last_row = rows[-1][0] if rows else 1
+    last_col = max((c for row in values.values() for c in row), default=0)
+    def widen(m):
+        ref = m.group(2).split(':')[-1]
+        col = max(_column_index(ref), last_col)
+        row = max(int(ref.lstrip('ABCDEFGHIJKLMNOPQRSTUVWXYZ') or 1), last_row)
+        first = m.group(2).split(':')[0]
+        return f'{m.group(1)}{first}:{_column_letters(col)}{row}"'
+    return re.sub(rf'(<{p}dimension\b[^>]*?\bref=")([^"]*)"', widen, xml, count=1)
+
+def _table_parts(zf, path):
+    """工作表上的表格 (Excel 的「格式化為表格」) 在 zip 內的路徑"""
+    base = posixpath.dirname(path)
+    try:
+        root = ET.fromstring(zf.read(posixpath.join(base, '_rels', posixpath.basename(path) + '.rels')))
+    except KeyError:
+        return []
+    return [_zip_target(base, rel.get('Target')) for rel in root.iter(_NS_PKG_REL + 'Relationship')
+            if rel.get('Type', '').endswith('/table') and rel.get('TargetMode') != 'External']
+
+def _widen_table(xml, first, last):
+    """寫入的列 (Excel 列號 first..last) 緊接在表格下面或與它重疊時，表格與篩選範圍延伸到 last"""
+    head = re.search(r'<(?:\w+:)?table\b[^>]*>', xml)
+    ref = re.search(r'\sref="([A-Z]+)(\d+):([A-Z]+)(\d+)"', head.group(0)) if head else None
+    if ref is None or re.search(r'\stotalsRowCount="[1-9]', head.group(0)):
+        # 有合計列的表格不動：新的列會落在合計列下面
+        return xml
+    top, bottom = int(ref.group(2)), int(ref.group(4))
+    if not top < first <= bottom + 1 or bottom >= last:
+        return xml
+    old = f'{ref.group(1)}{top}:{ref.group(3)}{bottom}'
+    new = f'{ref.group(1)}{top}:{ref.group(3)}{last}'
+    # <table ref> 與 <autoFilter ref> 是同一個範圍
+    return xml.replace(f'ref="{old}"', f'ref="{new}"')
+
+def write_cells(raw, sheet_name, values):
+    """在活頁簿的一張工作表寫入儲存格 (sheet_name 為 0 表示第一張)，回傳新的 xlsx 內容
+
+    values 是 {列索引: {欄位索引: 值}}。寫入的列接在表格下面時表格跟著延伸，
+    新的得獎者才會在表格與篩選範圍內。有寫入公式儲存格時 calcChain.xml 會過期，
+    比照 openpyxl 直接拿掉，Excel 開檔時會自己重建。
+    """
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(raw)) as zf:
+        sheets = _list_sheets(zf)
+        path = sheets[0][1] if sheet_name == 0 else dict(sheets)[sheet_name]
+        tables = set(_table_parts(zf, path)) if values else set()
+        with zipfile.ZipFile(out, 'w') as dst:
+            for info in zf.infolist():
+                if info.filename == 'xl/calcChain.xml':
+                    continue
+                data = zf.read(info)
+                if info.filename == path:
+                    data = _patch_sheet(data.decode('utf-8'), values).encode('utf-8')
+                elif info.filename in tables:
+                    data = _widen_table(data.decode('utf-8'), min(values) + 1, max(values) + 1).encode('utf-8')
+                elif info.filename == '[Content_Types].xml':
+                    data = re.sub(rb'<Override\b[^>]*?/xl/calcChain\.xml"[^>]*/>', b'', data)
+                elif info.filename == 'xl/_rels/workbook.xml.rels':
+                    data = re.sub(rb'<Relationship\b[^>]*?calcChain\.xml"[^>]*/>', b'', data)
+                dst.writestr(info, data)
+    return out.getvalue()
+
+def _text(value):
+    # 與 str(pandas 儲存格) 相同：空白儲存格會變成 'nan'
+    return 'nan' if value is None else str(value)
+
+def _normalize_id(value):
+    emp_id = _text(value).strip()
+    if emp_id.lower() == 'nan': emp_id = ''
+    if emp_id.endswith('.0'): emp_id = emp_id[:-2]
+    return emp_id
+
+def _header_index(rows):
+    """表頭 -> 欄位索引 (同名欄位以第一個為準，空白表頭比照 pandas 命名)"""
+    width = max(len(r) for r in rows)
+    columns = {}
+    for i in range(width):
+        col = rows[0][i] if i < len(rows[0]) else None
+        col = f"Unnamed: {i}" if col is None else str(col).strip()
+        columns.setdefault(col, i)
+    return columns
+
+# 人員名冊索引與建它時的 (名冊欄位設定, 工作表簽章)；工作表內容沒變就沿用，不重建
+DirectoryState = namedtuple('DirectoryState', ['key', 'signature', 'directory'])
+NO_DIRECTORY = DirectoryState(None, None, {})
+
+def build_directory(rows, col_id, col_name, col_dept):
+    """人員名單資料庫 -> {正規化工號: (姓名, 單位)}；重複的工號以第一筆為準"""
+    if not rows:
+        return {}
+    columns = _header_index(rows)
+    if col_id not in columns or col_name not in columns:
+        return {}
+    i_id = columns[col_id]
+    i_name = columns[col_name]
+    i_dept = columns.get(col_dept)
+
+    directory = {}
+    for row in rows[1:]:
+        if i_id >= len(row) or i_name >= len(row) or row[i_name] is None:
+            continue
+        emp_id = _normalize_id(row[i_id])
+        if not emp_id or emp_id in directory:
+            continue
+        dept = row[i_dept] if i_dept is not None and i_dept < len(row) else None
+        directory[emp_id] = (str(row[i_name]).strip(), "" if dept is None else str(dept).strip())
+    return directory
+
+# 得獎者記錄：tuple 大小的不可變物件 (沒有每筆一個 dict)，可以直接比較、當 dict 的鍵，
+# 在快照、歷史版本與搜尋索引之間共用
+Winner = namedtuple('Winner', ['name', 'dept', 'empId'])
+
+def winner_objects(winners):
+    """傳給畫面的物件格式 [{"name", "dept", "empId"}]"""
+    return [w._asdict() for w in winners]
+
+def share_records(old, new):
+    """重新解析後沿用上一版的物件：整個獎項沒變就用舊的 list，否則逐筆換成內容相同的舊記錄
+
+    每次存檔都會解析出一整批新字串；換成舊物件後，新的那批馬上就能釋放，
+    歷史版本 (_snapshots) 也只多出真正變動的幾筆，長時間開著常駐記憶體不會一直長。
+    """
+    if not old:
+        return new
+    shared, pool = {}, None
+    for award, winners in new.items():
+        previous = old.get(award)
+        if previous is not None and previous == winners:
+            shared[award] = previous
+            continue
+        if pool is None:
+            pool = {w: w for records in old.values() for w in records}
+        shared[award] = [pool.get(w, w) for w in winners]
+    return shared
+
+def group_winners(rows, col_award, col_name, col_dept, col_id, directory=None):
+    """把名單工作表的列依獎項分組 (以欄為單位處理，保留獎項出現順序)
+
+    規則與原本 pandas 版本相同：工號轉字串後去除重複 (保留第一筆，空白工號視為同一個)，
+    再去掉姓名空白的列。回傳 {"data": {獎項: [Winner]}} 或 {"error": 訊息}。
+    有提供 directory (見 build_directory) 時，只填了工號的列會用名冊帶出姓名與單位。
+    """
+    columns = _header_index(rows)
+
+    if col_name not in columns or col_award not in columns:
+        return {"error": f"Excel 找不到欄位：[{col_name}] 或 [{col_award}]"}
+
+    body = rows[1:]
+
+    def column(i):
+        return [r[i] if i < len(r) else None for r in body]
+
+    # 1. 工號整欄一次轉字串，標記重複 (drop_duplicates keep='first')
+    keep = [True] * len(body)
+    if col_id in columns:
+        raw_ids = [None if v is None else str(v) for v in column(columns[col_id])]
+        seen = set()
+        for i, emp_id in enumerate(raw_ids):
+            if emp_id in seen:
+                keep[i] = False
+            else:
+                seen.add(emp_id)
+    else:
+        raw_ids = [""] * len(body)
+
+    # 2. 只有工號的列由名冊帶出姓名/單位，之後姓名仍空白的列去掉 (dropna + strip() != '')
+    names = [None if v is None else str(v).strip() for v in column(columns[col_name])]
+    dept_values = column(columns[col_dept]) if col_dept in columns else [""] * len(body)
+    if directory and col_id in columns:
+        for i, name in enumerate(names):
+            if name or not keep[i]:
+                continue
+            hit = directory.get(_normalize_id(raw_ids[i]))
+            if hit is not None:
+                names[i] = hit[0]
+                if dept_values[i] is None or dept_values[i] == "":
+                    dept_values[i] = hit[1]
+    keep = [k and bool(n) for k, n in zip(keep, names)]
+
+    # 3. 只對留下來的列做字串清理與工號正規化
+    # 獎項與單位只有幾十種，intern 後每一列共用同一個字串物件
+    awards = [sys.intern(_text(v).strip()) for v in compress(column(columns[col_award]), keep)]
+    depts = [sys.intern(_text(v).strip()) for v in compress(dept_values, keep)]
+    emp_ids = [_normalize_id(v) for v in compress(raw_ids, keep)]
+
+    # 4. 依獎項分組 (dict 保留第一次出現的順序)
+    result = {}
+    for award, name, dept, emp_id in zip(awards, compress(names, keep), depts, emp_ids):
+        group = result.get(award)
+        if group is None:
+            group = result[award] = []
+        group.append(Winner(name, dept, emp_id))
+    return {"data": result}
 
-        if not os.path.exists(file_path):
-            return json.dumps({"error": "找不到 Excel 檔案", "path": EXCEL_FILENAME})
+# 原版 (pandas dropna()) 就有的設定：任一欄空白 (含選填的說明欄) 的列照舊略過，行為不變
+_DROPNA_CONFIG_KEYS = {"活動標題", "活動副標題", "滾動速度", "更新頻率",
+                       "欄位-獎項", "欄位-姓名", "欄位-單位", "欄位-工號"}
 
+def parse_config(conf_rows):
+    """系統設定工作表 -> (config, {視窗編號: 視窗設定})
+
+    之後加入的設定 (更新模式、畫質、視窗N-... 等) 只要設定項目與設定值有填就生效，說明欄可以空白。
+    """
+    config = DEFAULT_CONFIG.copy()
+    windows = {}
+    try:
+        width = max(len(r) for r in conf_rows)
+        for row in conf_rows[1:]:
+            if len(row) < 2 or row[0] is None or row[1] is None:
+                continue
+            key = str(row[0]).strip()
+            val = row[1]
+            if key in _DROPNA_CONFIG_KEYS and (len(row) < width or None in row):
+                continue
+
+            if key == "活動標題": config["title"] = str(val)
+            elif key == "活動副標題": config["subtitle"] = str(val)
+            elif key == "滾動速度": config["scroll_speed"] = float(val)
+            elif key == "更新頻率": config["refresh_rate"] = int(val) * 1000
+            elif key == "更新模式": config["update_mode"] = "poll" if str(val).strip() in ("輪詢", "poll") else "push"
+            elif key == "虛擬化門檻": config["virtual_threshold"] = int(val)
+            elif key == "傳輸格式": config["wire_format"] = "objects" if str(val).strip() in ("物件", "objects") else "columnar"
+            elif key == "畫質": config["quality"] = QUALITY_LEVELS.get(str(int(val)) if isinstance(val, float) else str(val).strip(), "auto")
+            elif key == "畫格預算": config["frame_budget"] = float(val)
+            elif key == "欄位-獎項": config["col_award"] = str(val)
+            elif key == "欄位-姓名": config["col_name"] = str(val)
+            elif key == "欄位-單位": config["col_dept"] = str(val)
+            elif key == "欄位-工號": config["col_id"] = str(val)
+            elif key == "名冊-工號": config["dir_col_id"] = str(val)
+            elif key == "名冊-姓名": config["dir_col_name"] = str(val)
+            elif key == "名冊-單位": config["dir_col_dept"] = str(val)
+            elif key.startswith("視窗") and key[2:].partition("-")[0].isdigit():
+                # 多視窗：視窗1-獎項、視窗1-標題、視窗1-副標題、視窗1-滾動速度 ...
+                number, _, field = key[2:].partition("-")
+                window = windows.setdefault(int(number), {})
+                if field == "獎項":
+                    window["awards"] = [a.strip() for a in str(val).replace("，", ",").replace("、", ",").split(",") if a.strip()]
+                elif field == "標題": window["title"] = str(val)
+                elif field == "副標題": window["subtitle"] = str(val)
+                elif field == "滾動速度": window["scroll_speed"] = float(val)
+    except:
+        pass
+    return config, windows
+
+# --- 欄式傳輸格式 ---
+# 整份名單送到畫面時不用 [{"name","dept","empId"}, ...]：鍵名不再每位重複，單位名稱改成字典編號。
+# awards/counts 依序切出每個獎項在 names/ids/dept 中的範圍；v 是格式版本，改格式時要加一。
+COLUMNS_VERSION = 1
+
+def encode_columns(data):
+    awards, counts, names, ids, dept = [], [], [], [], []
+    dept_codes = {}
+    for award, winners in data.items():
+        awards.append(award)
+        counts.append(len(winners))
+        for w in winners:
+            names.append(w.name)
+            ids.append(w.empId)
+            code = dept_codes.get(w.dept)
+            if code is None:
+                code = dept_codes[w.dept] = len(dept_codes)
+            dept.append(code)
+    return {
+        "v": COLUMNS_VERSION,
+        "awards": awards,
+        "counts": counts,
+        "depts": list(dept_codes),
+        "dept": dept,
+        "names": names,
+        "ids": ids
+    }
+
+def decode_columns(columns):
+    """encode_columns 的反向 (讀回磁碟快取時用)"""
+    if columns.get("v") != COLUMNS_VERSION:
+        raise ValueError(f"不支援的名單格式版本: {columns.get('v')}")
+    depts, names, codes, ids = columns["depts"], columns["names"], columns["dept"], columns["ids"]
+    data = {}
+    start = 0
+    for award, count in zip(columns["awards"], columns["counts"]):
+        end = start + count
+        data[award] = [Winner(name, depts[code], emp_id)
+                       for name, code, emp_id in zip(names[start:end], codes[start:end], ids[start:end])]
+        start = end
+    return data
+
+def build_payload(data, meta, version):
+    """完整回應的 JSON 字串；依 meta 的 wire_format 決定名單用欄式或物件格式"""
+    result = {"status": "success", "meta": meta, "version": version}
+    if meta["wire_format"] == "columnar":
+        result["columns"] = encode_columns(data)
+    else:
+        result["data"] = {award: winner_objects(winners) for award, winners in data.items()}
+    return json.dumps(result)
+
+# --- 抽獎紀錄檔 ---
+# Excel 之外的第二個名單來源：只會往後追加的 JSONL 或 CSV，每行一位得獎者，例如
+#   {"award": "頭獎", "empId": "A001"}      (鍵名也可以用 獎項/工號/姓名/單位)
+#   頭獎,A001,王小明,資訊部                 (姓名、單位可省略)
+# 只填工號時由人員名冊帶出姓名與單位。設定與名冊仍然來自 Excel。
+def parse_journal_line(line):
+    """一行紀錄 -> (獎項, 工號, 姓名, 單位)；空行、# 註解、表頭或格式不對時回傳 None"""
+    text = line.decode('utf-8', errors='replace').lstrip('\ufeff').strip()
+    if not text or text.startswith('#'):
+        return None
+    if text.startswith('{'):
+        try:
+            entry = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(entry, dict):
+            return None
+        fields = [entry.get(key, entry.get(alias)) for key, alias in
+                  (("award", "獎項"), ("empId", "工號"), ("name", "姓名"), ("dept", "單位"))]
+    else:
+        fields = next(csv.reader([text]), [])
+        if fields[:1] == ["獎項"]:
+            return None
+    fields = [("" if v is None else str(v)).strip() for v in fields[:4]]
+    fields += [""] * (4 - len(fields))
+    return tuple(fields) if fields[0] else None
+
+def winner_ids(data):
+    return {w.empId for winners in data.values() for w in winners}
+
+def merge_journal(data, entries, seen, directory=None, accepted=None):
+    """把紀錄檔的新行接在分組結果後面 (規則同 group_winners：工號重複保留第一筆、姓名空白略過)
+
+    data 不會被修改：有新增的獎項複製成新的 list，其餘沿用原本的 list，
+    因此成本只跟新行數 (與變動獎項的長度) 有關。seen 是已出現過的工號，會就地更新；
+    有提供 accepted 時，實際加入的 (獎項, 得獎者) 會附加進去。沒有任何新增時回傳原本的 data。
+    """
+    result = None
+    for award, emp_id, name, dept in entries:
+        emp_id = _normalize_id(emp_id)
+        if emp_id in seen:
+            continue
+        seen.add(emp_id)
+        if not name and directory:
+            hit = directory.get(emp_id)
+            if hit is not None:
+                name = hit[0]
+                dept = dept or hit[1]
+        if not name:
+            continue
+        if result is None:
+            result, copied = dict(data), set()
+        if award not in copied:
+            result[award] = list(result.get(award, ()))
+            copied.add(award)
+        record = Winner(name, sys.intern(dept or ""), emp_id)
+        result[award].append(record)
+        if accepted is not None:
+            accepted.append((award, record))
+    return data if result is None else result
+
+class DrawJournal:
+    """記住紀錄檔讀到的位元組位置，每次只讀新增的部分"""
+    def __init__(self, path, seen=None):
+        self.path = path
+        self.offset = 0
+        self.seen = set() if seen is None else seen
+        self.accepted = []      # 由紀錄檔加入名單的 (獎項, 得獎者)，匯出時寫回 Excel
+        self._file_id = None
+        self._partial = b''     # 還沒寫完換行的最後一行，下次再接上
+
+    def read_new(self):
+        """回傳新增的紀錄；檔案被截短或換成另一個檔案時回傳 None (要從頭重建)"""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return [] if self.offset == 0 else None
+        file_id = (st.st_dev, st.st_ino)
+        if (self._file_id is not None and file_id != self._file_id) or st.st_size < self.offset:
+            return None
+        self._file_id = file_id
+        if st.st_size == self.offset:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(st.st_size - self.offset)
+        self.offset += len(chunk)
+        lines = (self._partial + chunk).split(b'\n')
+        self._partial = lines.pop()
+        return [entry for entry in map(parse_journal_line, lines) if entry]
+
+    @property
+    def version_tag(self):
+        # 快照版本 = Excel 內容雜湊 + 紀錄檔讀到的位置
+        return f"-{self.offset:x}" if self.offset else ""
+
+# --- 搜尋索引 ---
+# 工號前綴與姓名片段的搜尋：每個獎項 (與人員名冊) 各有一組排好序的工號與「姓名後綴」，
+# 片段查詢就是後綴的前綴查詢，用 bisect 找到起點後往下讀到不符為止。
+# 快照換版時沒變的獎項沿用原索引，紀錄檔只在後面追加的獎項只插入新的幾筆。
+SEARCH_LIMIT = 30   # 每次最多回傳幾筆
+
+class _KeyIndex:
+    """排序的搜尋鍵與對應的名單位置 (兩個平行 list)"""
+    __slots__ = ('keys', 'positions')
+
+    def __init__(self, keys=(), positions=()):
+        # 排序位置的排列而不是 (鍵, 位置) tuple：少建一批物件，比較時也只比字串
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.keys = [keys[j] for j in order]
+        self.positions = [positions[j] for j in order]
+
+    def extended(self, pairs):
+        """複製一份再插入新的鍵 (舊索引可能正被其他執行緒查詢，不能就地修改)"""
+        index = _KeyIndex()
+        index.keys = list(self.keys)
+        index.positions = list(self.positions)
+        for key, i in zip(*pairs):
+            j = bisect.bisect_right(index.keys, key)
+            index.keys.insert(j, key)
+            index.positions.insert(j, i)
+        return index
+
+    def prefix(self, query):
+        """依鍵的順序產生所有以 query 開頭的位置"""
+        keys = self.keys
+        j = bisect.bisect_left(keys, query)
+        while j < len(keys) and keys[j].startswith(query):
+            yield self.positions[j]
+            j += 1
+
+    def exact(self, key):
+        j = bisect.bisect_left(self.keys, key)
+        return j < len(self.keys) and self.keys[j] == key
+
+def _search_pairs(people, start=0):
+    """[(工號, 姓名)] -> 工號鍵與姓名後綴鍵，各是 (鍵 list, 位置 list)"""
+    id_keys, id_positions, name_keys, name_positions = [], [], [], []
+    for i, (emp_id, name) in enumerate(people, start):
+        if emp_id:
+            id_keys.append(emp_id.casefold())
+            id_positions.append(i)
+        name = name.casefold()
+        for k in range(len(name)):
+            name_keys.append(name[k:])
+            name_positions.append(i)
+    return (id_keys, id_positions), (name_keys, name_positions)
+
+class SearchIndex:
+    """名單與人員名冊的搜尋索引；update 在背景執行緒呼叫，search 可同時從其他執行緒呼叫"""
+    def __init__(self):
+        self._data = None
+        self._awards = {}       # 獎項 -> (名單 list, 工號索引, 姓名索引)
+        self._directory = None  # (名冊 dict, [(工號, 姓名, 單位)], 工號索引, 姓名索引)
+        self._lock = threading.Lock()
+
+    def update(self, data, directory=None):
+        with self._lock:
+            if data is not self._data:
+                self._awards = {award: self._index_award(self._awards.get(award), winners)
+                                for award, winners in data.items()}
+                self._data = data
+            if not directory:
+                # 名冊變成空的 (例如刪掉人員名單資料庫工作表) 時，舊名冊的人也不能再搜得到
+                self._directory = None
+            elif self._directory is None or self._directory[0] is not directory:
+                people = [(emp_id, name, dept) for emp_id, (name, dept) in directory.items()]
+                ids, names = _search_pairs((p[0], p[1]) for p in people)
+                self._directory = (directory, people, _KeyIndex(*ids), _KeyIndex(*names))
+
+    @staticmethod
+    def _index_award(previous, winners):
+        if previous is not None:
+            old = previous[0]
+            if winners is old:
+                return previous
+            # 只在後面追加 (前面整段是同一批物件、順序不變)：只插入新的幾筆。
+            # share_records 會把重新解析的記錄換成舊物件，所以要逐筆比對，不能只看最後一筆
+            if len(winners) > len(old) and all(x is y for x, y in zip(winners, old)):
+                ids, names = _search_pairs(((w.empId, w.name) for w in winners[len(old):]), len(old))
+                return (winners, previous[1].extended(ids), previous[2].extended(names))
+        ids, names = _search_pairs((w.empId, w.name) for w in winners)
+        return (winners, _KeyIndex(*ids), _KeyIndex(*names))
+
+    def search(self, query, awards=None, limit=SEARCH_LIMIT):
+        """獎項名稱、得獎者 (工號前綴或姓名片段)、名冊中尚未得獎的人，依序最多 limit 筆
+
+        awards 有給時只列出這些獎項 (多視窗各自只搜自己顯示的獎項)。
+        """
+        query = str(query or "").strip()
+        key = query.casefold()
+        if not key:
+            return []
+        indexed = self._awards
+        directory = self._directory
+        shown = [(award, entry) for award, entry in indexed.items() if awards is None or award in awards]
+        results = [{"type": "award", "award": award, "count": len(entry[0])}
+                   for award, entry in shown if key in award.casefold()][:limit]
+
+        for award, (winners, ids, names) in shown:
+            seen = set()
+            for i in chain(ids.prefix(key), names.prefix(key)):
+                if i in seen:
+                    continue
+                seen.add(i)
+                w = winners[i]
+                results.append({"type": "winner", "award": award, "name": w.name, "dept": w.dept, "empId": w.empId})
+                if len(results) >= limit:
+                    return results
+
+        if directory is not None:
+            _, people, ids, names = directory
+            seen = set()
+            for i in chain(ids.prefix(key), names.prefix(key)):
+                if i in seen:
+                    continue
+                seen.add(i)
+                emp_id, name, dept = people[i]
+                if any(entry[1].exact(emp_id.casefold()) for entry in indexed.values()):
+                    continue   # 已經在上面列為得獎者
+                results.append({"type": "person", "name": name, "dept": dept, "empId": emp_id})
+                if len(results) >= limit:
+                    break
+        return results
+
+# --- 增量更新 ---
+SNAPSHOT_HISTORY = 8  # 保留最近幾個版本，讓落後的畫面也能拿到差異
+
+def _splice(old, new):
+    """以共同前綴/後綴找出最小的替換區段：old[start:start+remove] -> items"""
+    if len(new) >= len(old) and new[:len(old)] == old:
+        # 最常見的情況：只在後面追加 (切片比較在 C 裡完成)
+        return {"start": len(old), "remove": 0, "items": new[len(old):]}
+    limit = min(len(old), len(new))
+    start = 0
+    while start < limit and old[start] == new[start]:
+        start += 1
+    end = 0
+    while end < limit - start and old[-1 - end] == new[-1 - end]:
+        end += 1
+    return {"start": start, "remove": len(old) - start - end, "items": new[start:len(new) - end]}
+
+def build_delta(old, new):
+    """比較兩份依獎項分組的名單，回傳 (changes, removed)"""
+    changes = {}
+    for award, winners in new.items():
+        previous = old.get(award, [])
+        if previous is not winners and previous != winners:
+            change = changes[award] = _splice(previous, winners)
+            change["items"] = winner_objects(change["items"])
+    removed = [award for award in old if award not in new]
+    return changes, removed
+
+Snapshot = namedtuple('Snapshot', ['version', 'stat_key', 'payload', 'data', 'meta'])
+
+# --- 磁碟快照 ---
+# 上一次成功的回應存成 exe 旁的快取檔，下次啟動不用等解析就能先畫出名單。
+# 格式：第一行是 JSON 標頭 (格式版本、活頁簿路徑、mtime、大小、版本)，之後是 zlib 壓縮的回應本文。
+CACHE_FORMAT = 1
+
+def save_snapshot_cache(cache_path, file_path, snapshot):
+    header = {
+        "format": CACHE_FORMAT,
+        "path": os.path.abspath(file_path),
+        "stat": list(snapshot.stat_key),
+        "version": snapshot.version
+    }
+    payload = snapshot.payload or build_payload(snapshot.data, snapshot.meta, snapshot.version)
+    body = zlib.compress(payload.encode('utf-8'), 1)
+    # 先寫暫存檔再取代，程式中途被關掉也不會留下半個快取
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(header).encode('utf-8') + b'\n' + body)
+    os.replace(tmp_path, cache_path)
+
+def load_snapshot_cache(cache_path, file_path):
+    """讀回快取；不是同一個活頁簿或檔案損毀就回傳 None"""
+    try:
+        with open(cache_path, 'rb') as f:
+            blob = f.read()
+        line, _, body = blob.partition(b'\n')
+        header = json.loads(line.decode('utf-8'))
+        if header.get("format") != CACHE_FORMAT or header.get("path") != os.path.abspath(file_path):
+            return None
+        payload = zlib.decompress(body).decode('utf-8')
+        result = json.loads(payload)
+        if "columns" in result:
+            data = decode_columns(result["columns"])
+        else:
+            data = {award: [Winner(w["name"], w["dept"], w["empId"]) for w in winners]
+                    for award, winners in result["data"].items()}
+        return Snapshot(header["version"], tuple(header["stat"]), payload, data, result["meta"])
+    except (OSError, ValueError, KeyError, TypeError, zlib.error):
+        return None
+
+# --- 效能統計 ---
+STATS_WINDOW = 200  # 每個階段保留最近幾次的耗時
+
+class StageStats:
+    """各階段耗時的滾動統計；record 只是一次 deque.append，平常開著也幾乎沒有成本"""
+    def __init__(self, window=STATS_WINDOW):
+        self._window = window
+        self._samples = {}
+
+    def record(self, stage, seconds):
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self._window)
+        samples.append(seconds * 1000)
+
+    def summary(self):
+        """{階段: {count, last, p50, p95, max}}，單位為毫秒"""
+        out = {}
+        for stage, samples in list(self._samples.items()):
+            ordered = sorted(samples)
+            n = len(ordered)
+            if n == 0:
+                continue
+            out[stage] = {
+                "count": n,
+                "last": samples[-1],
+                "p50": ordered[n // 2],
+                "p95": ordered[min(n - 1, int(n * 0.95))],
+                "max": ordered[-1],
+            }
+        return out
+
+# --- 背景解析 ---
+# get_data 永遠立即回傳最新一份成功的快照；解析在背景執行緒進行，
+# 存檔途中讀不到檔案時保留舊快照，並依 RETRY_DELAYS 退避重試。
+RETRY_DELAYS = (0.5, 1, 2, 4, 8)  # 秒
+FIRST_LOAD_TIMEOUT = 30            # 第一次載入最多等幾秒
+
+class SnapshotWorker(threading.Thread):
+    def __init__(self, api):
+        super().__init__(daemon=True)
+        self.api = api
+        self.first_done = threading.Event()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+
+    def wake(self):
+        self._wake.set()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+
+    def run(self):
+        failures = 0
+        while not self._stop_event.is_set():
+            with self.api._refresh_lock:
+                ok = self.api._refresh()
+            self.first_done.set()
+            if ok:
+                self.api._update_search()
+            failures = 0 if ok else failures + 1
+            delay = None if ok else RETRY_DELAYS[min(failures, len(RETRY_DELAYS)) - 1]
+            self._wake.wait(delay)
+            self._wake.clear()
+
+class SnapshotSource:
+    """依畫面目前的版本，從 snapshot 與 _snapshots (歷史版本) 回傳 not_modified、差異或完整名單"""
+    def has_snapshot(self):
+        """不等待：現在就有名單可以回傳嗎"""
+        return self.snapshot is not None
+
+    def _respond(self, version):
+        snapshot = self.snapshot
+        if snapshot is None:
+            return json.dumps(self.last_error or {"error": "讀取中..."})
+
+        # 有更新的讀取失敗時，小回應帶上 stale 讓畫面提示「顯示的是上一份名單」
+        stale = self.last_error["error"] if self.last_error else None
+        self.client_stale = bool(stale)
+        if version is not None and version == snapshot.version:
+            reply = {"status": "not_modified", "version": snapshot.version}
+            if stale:
+                reply["stale"] = stale
+            return json.dumps(reply)
+
+        self.client_version = snapshot.version
+        if version in self._snapshots:
+            # 畫面已有舊版本：只送差異，前端只修補變動的卡片
+            start = time.perf_counter()
+            changes, removed = build_delta(self._snapshots[version], snapshot.data)
+            self.stats.record("build_delta", time.perf_counter() - start)
+            reply = {
+                "status": "delta",
+                "base": version,
+                "version": snapshot.version,
+                "order": list(snapshot.data),
+                "changes": changes,
+                "removed": removed,
+                "meta": snapshot.meta
+            }
+            if stale:
+                reply["stale"] = stale
+            return json.dumps(reply)
+        if snapshot.payload is None:
+            # 增量更新產生的快照不預先序列化，到有畫面需要完整名單時才做一次
+            payload = build_payload(snapshot.data, snapshot.meta, snapshot.version)
+            snapshot = self.snapshot = snapshot._replace(payload=payload)
+        return snapshot.payload
+
+class Api(SnapshotSource):
+    def __init__(self, file_path=None, cache_path=None, journal_path=None, pool=None):
+        self.file_path = file_path or get_excel_path()
+        self.cache_path = cache_path
+        self.journal_path = journal_path
+        self.pool = pool            # 多場次模式：解析交給共用的行程池 (見 parse_in_worker)
+        # 目前的快照 (不可變，整個替換)；last_error 是之後一次失敗的讀取
+        self.snapshot = None
+        self.last_error = None
+        self._attempt_stat = None   # 上次嘗試解析時 (Excel, 紀錄檔) 的 (mtime, size)
+        # 抽獎紀錄檔：_digest 是目前快照的 Excel 內容雜湊；_journal_ready 表示快照已包含紀錄檔讀到的位置
+        self._digest = None
+        self._journal = None
+        self._journal_ready = True
+        self._refresh_lock = threading.Lock()   # 背景解析與快速輸入不同時改動紀錄檔狀態
+        self._columns = (DEFAULT_CONFIG["col_award"], DEFAULT_CONFIG["col_name"],
+                         DEFAULT_CONFIG["col_dept"], DEFAULT_CONFIG["col_id"])
+        self._worker = None
+        self._lock = threading.Lock()
+        self.listeners = []         # 快照更新或讀取失敗時呼叫 (背景執行緒)
+        self.stats = StageStats()
+        # 各版本的名單，用來計算差異；client_version 是最後送給畫面的版本，client_stale 是最後的回應是否帶 stale
+        self._snapshots = OrderedDict()
+        self.client_version = None
+        self.client_stale = False
+        # 人員名冊索引 (見 DirectoryState)；directory 是 _directory.directory
+        self.directory = {}
+        self._directory = NO_DIRECTORY
+        self.search_index = SearchIndex()
+        if cache_path:
+            self._load_cache()
+
+    def _load_cache(self):
+        # 快取先頂上當作目前快照；背景執行緒會照常比對 mtime/size，檔案變了就重新解析換掉
+        start = time.perf_counter()
+        snapshot = load_snapshot_cache(self.cache_path, self.file_path)
+        if snapshot is None:
+            return
+        self.snapshot = snapshot
+        self._snapshots[snapshot.version] = snapshot.data
+        # 快取裡若含有紀錄檔的內容 (或現在有紀錄檔)，第一次檢查時要從 Excel 完整重建
+        self._digest, _, journal_tag = snapshot.version.partition('-')
+        self._journal_ready = not journal_tag and _stat_key(self.journal_path) is None
+        self.stats.record("load_cache", time.perf_counter() - start)
+
+    def _save_cache(self, snapshot):
+        if not self.cache_path:
+            return
         try:
-            # 1. 讀取設定
-            config = DEFAULT_CONFIG.copy()
+            save_snapshot_cache(self.cache_path, self.file_path, snapshot)
+        except OSError:
+            # 快取只是加速用，寫不進去 (唯讀目錄等) 就算了
+            pass
+
+    @property
+    def version(self):
+        snapshot = self.snapshot
+        return snapshot.version if snapshot else None
+
+    @property
+    def update_mode(self):
+        snapshot = self.snapshot
+        return snapshot.meta["update_mode"] if snapshot else DEFAULT_CONFIG["update_mode"]
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            self._worker = SnapshotWorker(self)
+            self._worker.start()
+
+    def request_refresh(self):
+        """通知背景執行緒檢查檔案 (不等待結果)"""
+        self._ensure_worker()
+        self._worker.wake()
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.stop()
+
+    def get_data(self, version=None):
+        start = time.perf_counter()
+        self.check_file()
+        with self._lock:
+            response = self._respond(version)
+        self.stats.record("get_data", time.perf_counter() - start)
+        return response
+
+    def check_file(self, wait=True):
+        """只做 stat：檔案和上次嘗試時不同才叫醒背景執行緒，失敗的重試交給它退避"""
+        self._ensure_worker()
+        stat_key = (_stat_key(self.file_path), _stat_key(self.journal_path))
+        if stat_key != self._attempt_stat:
+            self._worker.wake()
+        if wait and self.snapshot is None and self.last_error is None:
+            self._worker.first_done.wait(FIRST_LOAD_TIMEOUT)
+
+    def get_stats(self):
+        return json.dumps({"python": self.stats.summary()})
+
+    def search(self, query, awards=None):
+        """搜尋 (S)：獎項名稱、得獎者的工號前綴或姓名片段，以及名冊中尚未得獎的人"""
+        start = time.perf_counter()
+        snapshot = self.snapshot
+        if snapshot is None:
+            return json.dumps({"error": "名單尚未載入"})
+        self._update_search()
+        results = self.search_index.search(query, awards)
+        self.stats.record("search", time.perf_counter() - start)
+        return json.dumps({"version": snapshot.version, "results": results})
+
+    def _update_search(self):
+        # 背景執行緒每次換上新快照後就先建好；已是最新時只比對一下物件
+        snapshot = self.snapshot
+        if snapshot is not None:
+            self.search_index.update(snapshot.data, self.directory)
+
+    def add_winner(self, award, emp_id):
+        """快速輸入：工號對照人員名冊後寫進抽獎紀錄檔並立即併入名單，不必等 Excel 存檔與重新解析"""
+        start = time.perf_counter()
+        award = str(award or "").strip()
+        emp_id = _normalize_id(emp_id)
+        if not award or not emp_id:
+            return json.dumps({"error": "請輸入獎項與工號"})
+        if not self.journal_path:
+            return json.dumps({"error": "沒有設定抽獎紀錄檔"})
+        hit = self.directory.get(emp_id)
+        if hit is None:
+            return json.dumps({"error": f"人員名冊找不到工號 {emp_id}"})
+        name, dept = hit
+
+        with self._refresh_lock:
+            if self.snapshot is None:
+                return json.dumps({"error": "名單尚未載入"})
+            seen = self._journal.seen if self._journal is not None else winner_ids(self.snapshot.data)
+            if emp_id in seen:
+                return json.dumps({"error": f"工號 {emp_id} 已經在得獎名單中"})
+            line = json.dumps({"award": award, "empId": emp_id, "name": name, "dept": dept}, ensure_ascii=False)
             try:
-                df_conf = pd.read_excel(file_path, sheet_name='系統設定')
-                for _, row in df_conf.dropna().iterrows():
-                    key = str(row[0]).strip()
-                    val = row[1]
-                    
-                    if key == "活動標題": config["title"] = str(val)
-                    elif key == "活動副標題": config["subtitle"] = str(val)
-                    elif key == "滾動速度": config["scroll_speed"] = float(val)
-                    elif key == "更新頻率": config["refresh_rate"] = int(val) * 1000
-                    elif key == "欄位-獎項": config["col_award"] = str(val)
-                    elif key == "欄位-姓名": config["col_name"] = str(val)
-                    elif key == "欄位-單位": config["col_dept"] = str(val)
-                    elif key == "欄位-工號": config["col_id"] = str(val)
-            except:
-                pass 
-
-            col_award = config["col_award"]
-            col_name = config["col_name"]
-            col_dept = config["col_dept"]
-            col_id = config["col_id"]
-
-            # 2. 讀取名單 (強制工號轉字串)
+                with open(self.journal_path, 'a+b') as f:
+                    # 上一行沒有換行結尾 (其他程式寫到一半) 時先補上，避免兩筆黏在一起
+                    if f.tell() > 0:
+                        f.seek(-1, os.SEEK_END)
+                        if f.read(1) != b'\n':
+                            f.write(b'\n')
+                    f.write(line.encode('utf-8') + b'\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                return json.dumps({"error": f"寫入抽獎紀錄失敗: {str(e)}"})
+            if self._journal_ready:
+                self._tail_journal()
+            else:
+                self.request_refresh()
+        self.stats.record("add_winner", time.perf_counter() - start)
+        return json.dumps({"status": "ok", "award": award, "name": name, "dept": dept, "empId": emp_id})
+
+    def export_winners(self):
+        """把紀錄檔加入的得獎者接在活頁簿副本的得獎名單後面 (活動結束後歸檔用)，回傳副本路徑"""
+        journal = self._journal
+        if journal is None or not journal.accepted:
+            return json.dumps({"error": "沒有需要匯出的抽獎紀錄"})
+
+        col_award, col_name, col_dept, col_id = self._columns
+        try:
+            with open(self.file_path, 'rb') as f:
+                raw = f.read()
+            sheets = read_workbook(raw, [WINNER_SHEET, 0])
+            sheet = WINNER_SHEET if WINNER_SHEET in sheets else 0
+            rows = sheets.get(sheet)
+            if not rows:
+                return json.dumps({"error": "匯出失敗: 工作表是空的"})
+            header = _header_index(rows)
+            if col_award not in header or col_id not in header:
+                return json.dumps({"error": f"Excel 找不到欄位：[{col_award}] 或 [{col_id}]"})
+
+            # 接在最後一列有獎項或工號的後面 (姓名/單位欄常預先拉好 VLOOKUP 公式，不能用最後一列)
+            # 序號依獎項往下編，金額沿用同獎項的第一筆
+            def cell(row, col):
+                return row[col] if col < len(row) else None
+            last, numbers, amounts = 0, {}, {}
+            for i, row in enumerate(rows[1:], 1):
+                award = cell(row, header[col_award])
+                if award is None and cell(row, header[col_id]) is None:
+                    continue
+                last = i
+                numbers[award] = numbers.get(award, 0) + 1
+                if "金額" in header:
+                    amounts.setdefault(award, cell(row, header["金額"]))
+            values = {}
+            for award, record in journal.accepted:
+                last += 1
+                numbers[award] = numbers.get(award, 0) + 1
+                fields = {"序號": numbers[award], "金額": amounts.get(award), col_award: award,
+                          col_id: record.empId, col_name: record.name, col_dept: record.dept}
+                values[last] = {header[key]: value for key, value in fields.items()
+                                if key in header and value is not None}
+            path = os.path.splitext(self.file_path)[0] + '_匯出.xlsx'
+            data = write_cells(raw, sheet, values)
+            with open(path, 'wb') as f:
+                f.write(data)
+        except Exception as e:
+            return json.dumps({"error": f"匯出失敗: {str(e)}"})
+        return json.dumps({"status": "ok", "path": path, "count": len(journal.accepted)})
+
+    def _notify(self):
+        for listener in list(self.listeners):
             try:
-                converters = {col_id: str}
-                try:
-                    df = pd.read_excel(file_path, sheet_name='得獎名單', converters=converters)
-                except:
-                    df = pd.read_excel(file_path, sheet_name=0, converters=converters)
-            except Exception as e:
-                return json.dumps({"error": f"讀取名單失敗: {str(e)}"})
+                listener()
+            except Exception:
+                pass
 
-            df.columns = df.columns.str.strip()
+    def _fail(self, error):
+        with self._lock:
+            self.last_error = error
+        self._notify()
+        return False
 
-            if col_name not in df.columns or col_award not in df.columns:
-                return json.dumps({"error": f"Excel 找不到欄位：[{col_name}] 或 [{col_award}]"})
+    def _refresh(self):
+        """背景執行緒：檔案有變才重新解析，成功就換上新快照。回傳是否成功。"""
+        file_path = self.file_path
+        stat_key = _stat_key(file_path)
+        self._attempt_stat = (stat_key, _stat_key(self.journal_path))
+        if stat_key is None:
+            return self._fail({"error": "找不到 Excel 檔案", "path": os.path.basename(file_path)})
 
-            if col_id in df.columns:
-                df = df.drop_duplicates(subset=[col_id], keep='first')
-            
-            df = df.dropna(subset=[col_name])
-            df = df[df[col_name].astype(str).str.strip() != '']
-
-            result = {}
-            for _, row in df.iterrows():
-                award = str(row[col_award]).strip()
-                name = str(row[col_name]).strip()
-                dept = str(row[col_dept]).strip() if col_dept in df.columns else ""
-                
-                raw_emp_id = row[col_id] if col_id in df.columns else ""
-                emp_id = str(raw_emp_id).strip()
-                if emp_id.lower() == 'nan': emp_id = ''
-                if emp_id.endswith('.0'): emp_id = emp_id[:-2]
+        current = self.snapshot
+        # 從快取啟動時人員名冊還沒讀過 (快速輸入與搜尋要用)，第一次檢查仍完整解析一次
+        directory_ready = self._directory.key is not None
+        if (current is not None and stat_key == current.stat_key and self.last_error is None
+                and self._journal_ready and directory_ready):
+            # Excel 沒變：只處理紀錄檔新增的行
+            return self._tail_journal()
 
-                if award not in result:
-                    result[award] = []
-                
-                result[award].append({"name": name, "dept": dept, "empId": emp_id})
-
-            return json.dumps({
-                "status": "success", 
-                "data": result, 
-                "meta": {
-                    "title": config["title"],
-                    "subtitle": config["subtitle"],
-                    "scroll_speed": config["scroll_speed"],
-                    "refresh_rate": config["refresh_rate"]
-                }
-            })
+        # mtime/size 變了才讀檔；內容雜湊相同 (例如只是重新存檔) 仍視為未變更
+        stats = self.stats
+        start = time.perf_counter()
+        try:
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            return self._fail({"error": f"讀取錯誤: {str(e)}"})
+        stats.record("read_file", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        digest = hashlib.sha1(raw).hexdigest()[:16]
+        stats.record("hash", time.perf_counter() - start)
+        if current is not None and digest == self._digest and self._journal_ready and directory_ready:
+            with self._lock:
+                self.snapshot = current._replace(stat_key=stat_key)
+                recovered = self.last_error is not None
+                self.last_error = None
+            if recovered:
+                self._notify()
+            self._save_cache(self.snapshot)
+            return self._tail_journal()
+
+        start = time.perf_counter()
+        result = self._parse_raw(raw)
+        stats.record("parse", time.perf_counter() - start)
+        if "error" in result:
+            return self._fail(result)
+
+        # 與上一版相同的獎項與得獎者沿用舊物件 (見 share_records)
+        start = time.perf_counter()
+        data = share_records(current.data if current is not None else None, result["data"])
+        stats.record("share_records", time.perf_counter() - start)
+
+        # 紀錄檔從頭讀一次接在 Excel 名單後面，之後只讀新增的行
+        version = digest
+        journal = None
+        if self.journal_path:
+            start = time.perf_counter()
+            journal = DrawJournal(self.journal_path, winner_ids(data))
+            try:
+                data = merge_journal(data, journal.read_new() or [], journal.seen, self.directory, journal.accepted)
+            except OSError as e:
+                return self._fail({"error": f"讀取抽獎紀錄失敗: {str(e)}"})
+            version += journal.version_tag
+            stats.record("journal", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        payload = build_payload(data, result["meta"], version)
+        stats.record("json_dumps", time.perf_counter() - start)
+
+        self._digest = digest
+        self._journal = journal
+        self._journal_ready = True
+        snapshot = Snapshot(version, stat_key, payload, data, result["meta"])
+        self._install(snapshot)
+        self._save_cache(snapshot)
+        return True
+
+    def _tail_journal(self):
+        """把紀錄檔新增的行併入目前的快照；成本只跟新行數有關，不重讀 Excel"""
+        if not self.journal_path:
+            return True
+        current = self.snapshot
+        journal = self._journal
+        if journal is None:
+            # 紀錄檔是在上次解析之後才出現的
+            journal = self._journal = DrawJournal(self.journal_path, winner_ids(current.data))
+        start = time.perf_counter()
+        try:
+            entries = journal.read_new()
+        except OSError as e:
+            return self._fail({"error": f"讀取抽獎紀錄失敗: {str(e)}"})
+        if entries is None:
+            # 紀錄檔被截短、刪除或換掉：從 Excel 完整重建
+            self._journal = None
+            self._journal_ready = False
+            return self._refresh()
+        data = merge_journal(current.data, entries, journal.seen, self.directory, journal.accepted)
+        self.stats.record("journal", time.perf_counter() - start)
+        if data is current.data:
+            return True
+        # 完整 JSON 延到有畫面需要時才產生 (見 _respond)，推送給畫面的只有差異
+        self._install(Snapshot(self._digest + journal.version_tag, current.stat_key, None, data, current.meta))
+        return True
+
+    def _install(self, snapshot):
+        with self._lock:
+            self.snapshot = snapshot
+            self.last_error = None
+            self._snapshots[snapshot.version] = snapshot.data
+            self._snapshots.move_to_end(snapshot.version)
+            while len(self._snapshots) > SNAPSHOT_HISTORY:
+                self._snapshots.popitem(last=False)
+        self._notify()
+
+    def _parse_raw(self, raw):
+        if self.pool is None:
+            result, directory = parse_workbook(raw, self._directory, self.stats)
+        else:
+            # 在子行程解析，不佔這個行程的 GIL；名冊只在子行程重建過時才傳回來 (見 parse_in_worker)
+            known = (self._directory.key, self._directory.signature)
+            try:
+                result, directory = self.pool.submit(parse_in_worker, self.file_path, raw, known).result()
+            except Exception as e:
+                return {"error": f"讀取錯誤: {str(e)}"}
+            if directory is not None:
+                directory = DirectoryState._make(directory)
+            if "data" in result:
+                result["data"] = {award: [Winner._make(w) for w in winners] for award, winners in result["data"].items()}
+        if directory is not None:
+            self._directory = directory
+            self.directory = directory.directory
+        if "data" in result:
+            self._columns = result.pop("columns")
+        return result
 
-        except Exception as e:
-            return json.dumps({"error": f"讀取錯誤: {str(e)}"})
-    
     def toggle_fullscreen(self):
+        import webview
         window = webview.windows[0]
         window.toggle_fullscreen()
 
+# --- 多視窗 ---
+# 系統設定的「視窗N-獎項 / 標題 / 副標題 / 滾動速度」各開一個視窗。
+# 每個視窗是共用 Api 快照的一個 BoardView：活頁簿只解析一次，各視窗只篩選獎項、覆寫標題與速度。
+def read_window_settings(path):
+    """啟動時只讀系統設定工作表，回傳「視窗N-...」設定 (依 N 排序)；讀不到時回傳 []"""
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        sheets = read_workbook(raw, [CONFIG_SHEET])
+    except (OSError, zipfile.BadZipFile, KeyError, ET.ParseError):
+        return []
+    _, windows = parse_config(sheets.get(CONFIG_SHEET))
+    return [windows[n] for n in sorted(windows)]
+
+class BoardView(SnapshotSource):
+    def __init__(self, api, index):
+        self._api = api
+        self._index = index         # 對應 meta["windows"] 的第幾個設定
+        self._window = None
+        self._lock = threading.Lock()
+        self.snapshot = None
+        self._snapshots = OrderedDict()
+        self.client_version = None
+        self.client_stale = False
+
+    @property
+    def stats(self):
+        return self._api.stats
+
+    def has_snapshot(self):
+        return self._api.snapshot is not None
+
+    @property
+    def last_error(self):
+        return self._api.last_error
+
+    @property
+    def update_mode(self):
+        return self._api.update_mode
+
+    def get_data(self, version=None):
+        start = time.perf_counter()
+        self._api.check_file()
+        with self._lock:
+            self._sync()
+            response = self._respond(version)
+        self.stats.record("get_data", time.perf_counter() - start)
+        return response
+
+    def get_stats(self):
+        return self._api.get_stats()
+
+    def search(self, query):
+        # 共用同一份索引，只搜這個視窗有顯示的獎項 (名冊中的人員照列)
+        with self._lock:
+            self._sync()
+        return self._api.search(query, self.snapshot.data if self.snapshot else None)
+
+    def add_winner(self, award, emp_id):
+        return self._api.add_winner(award, emp_id)
+
+    def export_winners(self):
+        return self._api.export_winners()
+
+    def _sync(self):
+        """共用快照換版時，重新篩出這個視窗的名單 (每個版本只做一次)"""
+        base = self._api.snapshot
+        if base is None or (self.snapshot is not None and self.snapshot.version == base.version):
+            return
+        windows = base.meta.get("windows") or []
+        settings = windows[self._index] if self._index < len(windows) else {}
+        awards = settings.get("awards")
+        data = {award: winners for award, winners in base.data.items() if not awards or award in awards}
+        meta = dict(base.meta, windows=[])
+        for key in ("title", "subtitle", "scroll_speed"):
+            if key in settings:
+                meta[key] = settings[key]
+        self.snapshot = Snapshot(base.version, base.stat_key, None, data, meta)
+        self._snapshots[base.version] = data
+        while len(self._snapshots) > SNAPSHOT_HISTORY:
+            self._snapshots.popitem(last=False)
+
+    def toggle_fullscreen(self):
+        self._window.toggle_fullscreen()
+
+# --- 多場次 ---
+# --sessions 資料夾：資料夾裡每本活頁簿是一個場次，各有自己的 Api (快照、背景執行緒、快取檔)。
+# 解析在共用的行程池進行，一本大檔案還在解析時，其他場次的更新照樣各自完成、各自推送。
+SESSION_CACHE_DIR = '.抽獎快取'
+
+def parse_workbook(raw, directory=NO_DIRECTORY, stats=None):
+    """解析一本活頁簿，回傳 (結果, 名冊)
+
+    結果是 {"status", "data", "meta", "columns"} 或 {"error"}；名冊是 DirectoryState，
+    人員名冊工作表內容與欄位設定都沒變就沿用傳入的 directory (同一個物件)。
+    """
+    stats = stats or StageStats()
+    try:
+        wanted = [CONFIG_SHEET, WINNER_SHEET, 0, DIRECTORY_SHEET]
+        signatures = {DIRECTORY_SHEET: directory.signature}
+        start = time.perf_counter()
+        try:
+            try:
+                sheets = read_workbook(raw, wanted, signatures)
+            except (zipfile.BadZipFile, KeyError, ET.ParseError):
+                sheets = read_workbook_pandas(raw, wanted)
+                signatures = {}
+        except Exception as e:
+            return {"error": f"讀取名單失敗: {str(e)}"}, directory
+        stats.record("read_workbook", time.perf_counter() - start)
+
+        # 1. 讀取設定
+        config, windows = parse_config(sheets.get(CONFIG_SHEET))
+
+        col_award = config["col_award"]
+        col_name = config["col_name"]
+        col_dept = config["col_dept"]
+        col_id = config["col_id"]
+
+        # 2. 讀取名單
+        winner_rows = sheets.get(WINNER_SHEET, sheets.get(0))
+        if not winner_rows:
+            return {"error": "讀取名單失敗: 工作表是空的"}, directory
+
+        start = time.perf_counter()
+        directory = update_directory(directory, raw, sheets.get(DIRECTORY_SHEET), signatures.get(DIRECTORY_SHEET), config)
+        stats.record("directory", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = group_winners(winner_rows, col_award, col_name, col_dept, col_id, directory.directory)
+        stats.record("group_winners", time.perf_counter() - start)
+        if "error" in result:
+            return result, directory
+
+        return {
+            "status": "success", 
+            "data": result["data"], 
+            "meta": {
+                "title": config["title"],
+                "subtitle": config["subtitle"],
+                "scroll_speed": config["scroll_speed"],
+                "refresh_rate": config["refresh_rate"],
+                "update_mode": config["update_mode"],
+                "virtual_threshold": config["virtual_threshold"],
+                "wire_format": config["wire_format"],
+                "quality": config["quality"],
+                "frame_budget": config["frame_budget"],
+                "windows": [windows[n] for n in sorted(windows)]
+            },
+            "columns": (col_award, col_name, col_dept, col_id)
+        }, directory
+
+    except Exception as e:
+        return {"error": f"讀取錯誤: {str(e)}"}, directory
+
+def update_directory(directory, raw, rows, signature, config):
+    """工作表簽章與名冊欄位設定都沒變就沿用 directory，否則重建"""
+    key = (config["dir_col_id"], config["dir_col_name"], config["dir_col_dept"])
+    if rows is SHEET_UNCHANGED and key == directory.key:
+        return directory
+    if rows is SHEET_UNCHANGED:
+        # 名冊內容沒變但欄位設定改了：這次要重新解析名冊
+        rows = read_workbook(raw, [DIRECTORY_SHEET]).get(DIRECTORY_SHEET)
+    return DirectoryState(key, signature, build_directory(rows, *key))
+
+# 子行程內各檔案上次建好的名冊 (同一個子行程下次解析同一個檔案時沿用)
+_worker_directories = {}
+
+def parse_in_worker(path, raw, known):
+    """行程池的工作：在子行程解析一本活頁簿，回傳 (結果, 名冊或 None)
+
+    known 是主行程持有的名冊 (key, signature)；名冊在這裡重建過或與它不同時才傳回，
+    其餘時候不必把整份名冊序列化送回去。得獎者以一般 tuple 傳回
+    (Windows 的子行程是以 __mp_main__ 載入本檔，Winner 在主行程反序列化不回來)。
+    """
+    cached = _worker_directories.get(path, NO_DIRECTORY)
+    result, directory = parse_workbook(raw, cached)
+    _worker_directories[path] = directory
+    if "data" in result:
+        result["data"] = {award: [tuple(w) for w in winners] for award, winners in result["data"].items()}
+    if directory is cached and (directory.key, directory.signature) == known:
+        return result, None
+    return result, tuple(directory)
+
+def _is_session_file(filename):
+    # 略過 Excel 開檔時的鎖定檔 (~$...) 與匯出的副本
+    return (filename.lower().endswith('.xlsx') and not filename.startswith('~$')
+            and not filename.endswith('_匯出.xlsx'))
+
+class SessionBoard:
+    """資料夾裡的所有場次；rotate 秒數大於 0 時看板輪流顯示各場次，否則合併成一個畫面"""
+    def __init__(self, directory, pool, rotate=0):
+        self.directory = os.path.abspath(directory)
+        self.pool = pool
+        self.rotate = rotate
+        self.turn = 0
+        self.sessions = OrderedDict()   # 場次名稱 (檔名去掉副檔名) -> Api
+        self.listeners = []             # 任一場次更新、讀取失敗或輪播換場時呼叫
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        if rotate > 0:
+            threading.Thread(target=self._rotate_loop, daemon=True).start()
+
+    def scan(self):
+        """依資料夾內容增減場次：新的活頁簿開一個 Api 並開始背景解析，刪掉的關閉"""
+        try:
+            files = {os.path.splitext(f)[0]: f for f in os.listdir(self.directory) if _is_session_file(f)}
+        except OSError:
+            files = {}
+        cache_dir = os.path.join(self.directory, SESSION_CACHE_DIR)
+        added, removed = [], []
+        with self._lock:
+            sessions = OrderedDict()
+            for name in sorted(files):
+                api = self.sessions.get(name)
+                if api is None:
+                    try:
+                        os.makedirs(cache_dir, exist_ok=True)
+                        cache_path = os.path.join(cache_dir, name + '.cache')
+                    except OSError:
+                        cache_path = None
+                    api = Api(os.path.join(self.directory, files[name]), cache_path=cache_path, pool=self.pool)
+                    api.listeners.append(self._notify)
+                    added.append(api)
+                sessions[name] = api
+            removed = [api for name, api in self.sessions.items() if name not in sessions]
+            self.sessions = sessions
+        for api in added:
+            api.request_refresh()
+        for api in removed:
+            api.close()
+        if removed or any(api.snapshot is not None for api in added):
+            self._notify()
+
+    def request_refresh(self):
+        """資料夾有變動：先同步場次，再叫醒各場次的背景執行緒 (沒變的只做一次 stat)"""
+        self.scan()
+        for api in list(self.sessions.values()):
+            api.request_refresh()
+
+    def check_files(self):
+        """各場次做一次 stat；都還沒載入時等到第一個場次好 (不等最慢的那一本)"""
+        for api in list(self.sessions.values()):
+            api.check_file(wait=False)
+        deadline = time.monotonic() + FIRST_LOAD_TIMEOUT
+        while not self.ready() and self.last_error is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+    def ready(self):
+        """[(場次名稱, 快照)]，只列出已經載入的場次"""
+        return [(name, api.snapshot) for name, api in list(self.sessions.items()) if api.snapshot is not None]
+
+    @property
+    def last_error(self):
+        for name, api in list(self.sessions.items()):
+            error = api.last_error
+            if error:
+                return dict(error, error=f"{name}: {error['error']}")
+        if not self.sessions:
+            return {"error": "資料夾裡沒有 Excel 檔案", "path": self.directory}
+        return None
+
+    @property
+    def update_mode(self):
+        ready = self.ready()
+        return ready[0][1].meta["update_mode"] if ready else DEFAULT_CONFIG["update_mode"]
+
+    def close(self):
+        self._stop_event.set()
+        for api in list(self.sessions.values()):
+            api.close()
+
+    def _rotate_loop(self):
+        while not self._stop_event.wait(self.rotate):
+            if len(self.ready()) > 1:
+                self.turn += 1
+                self._notify()
+
+    def _notify(self):
+        for listener in list(self.listeners):
+            try:
+                listener()
+            except Exception:
+                pass
+
+class SessionView(SnapshotSource):
+    """多場次看板：把各場次的快照合併 (獎項前面加上場次名稱) 或取輪播中的那一場，當成一份快照提供給畫面"""
+    def __init__(self, board):
+        self._board = board
+        self._window = None
+        self._lock = threading.Lock()
+        self._key = None            # 目前快照由哪些 (場次, 版本) 組成
+        self.snapshot = None
+        self._snapshots = OrderedDict()
+        self.client_version = None
+        self.client_stale = False
+        self.listeners = []
+        self.stats = StageStats()
+        board.listeners.append(self._changed)
+
+    @property
+    def last_error(self):
+        return self._board.last_error
+
+    def has_snapshot(self):
+        return bool(self._board.ready())
+
+    @property
+    def update_mode(self):
+        return self._board.update_mode
+
+    def get_data(self, version=None):
+        start = time.perf_counter()
+        self._board.check_files()
+        with self._lock:
+            self._sync()
+            response = self._respond(version)
+        self.stats.record("get_data", time.perf_counter() - start)
+        return response
+
+    def get_stats(self):
+        summary = self.stats.summary()
+        for name, api in list(self._board.sessions.items()):
+            parse = api.stats.summary().get("parse")
+            if parse:
+                summary[f"parse:{name}"] = parse
+        return json.dumps({"python": summary})
+
+    def search(self, query):
+        # 各場次各自的索引；合併顯示時獎項要加上場次名稱，才對得到畫面上的區塊
+        with self._lock:
+            self._sync()
+        results = []
+        key = self._key or ()
+        for name, _ in key:
+            api = self._board.sessions.get(name)
+            if api is None:
+                continue
+            response = json.loads(api.search(query))
+            for r in response.get("results", ()):
+                if len(key) > 1:
+                    if "award" in r:
+                        r["award"] = f"{name}・{r['award']}"
+                    else:
+                        r["session"] = name
+                results.append(r)
+        return json.dumps({"version": self.snapshot.version if self.snapshot else None,
+                           "results": results[:SEARCH_LIMIT]})
+
+    def add_winner(self, award, emp_id):
+        return json.dumps({"error": "多場次模式不支援快速輸入"})
+
+    def export_winners(self):
+        return json.dumps({"error": "多場次模式不支援匯出"})
+
+    def _changed(self):
+        # 先換好合併後的快照，再通知畫面 (推送與 SSE 讀到的 snapshot 都是新的)
+        with self._lock:
+            self._sync()
+        for listener in list(self.listeners):
+            try:
+                listener()
+            except Exception:
+                pass
+
+    def _sync(self):
+        ready = self._board.ready()
+        if not ready:
+            return
+        if self._board.rotate > 0:
+            ready = [ready[self._board.turn % len(ready)]]
+        key = tuple((name, snapshot.version) for name, snapshot in ready)
+        if key == self._key:
+            return
+        if len(ready) == 1:
+            data = ready[0][1].data
+        else:
+            # 各場次的名單物件直接共用，差異計算只會看到換版的那一場
+            data = {}
+            for name, snapshot in ready:
+                for award, winners in snapshot.data.items():
+                    data[f"{name}・{award}"] = winners
+        meta = dict(ready[0][1].meta, windows=[])
+        version = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+        self._key = key
+        self.snapshot = Snapshot(version, None, None, data, meta)
+        self._snapshots[version] = data
+        while len(self._snapshots) > SNAPSHOT_HISTORY:
+            self._snapshots.popitem(last=False)
+
+    def toggle_fullscreen(self):
+        self._window.toggle_fullscreen()
+
+# --- 檔案監看 (推送模式) ---
+# Linux 用 inotify 監看所在資料夾，其他平台退回 stat 輪詢。
+# Excel 存檔會先寫暫存檔再改名，所以事件停歇 debounce 秒後才通知一次。
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+def _inotify_watch(directory):
+    """回傳已監看 directory 的 inotify fd；不支援時回傳 None"""
+    if not sys.platform.startswith('linux'):
+        return None
+    # ctypes 只有這裡用到，其他平台不必在啟動時載入
+    import ctypes
+    import ctypes.util
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        fd = libc.inotify_init1(_IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM |
+                _IN_MOVED_TO | _IN_CREATE | _IN_DELETE)
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+class FileWatcher(threading.Thread):
+    """監看一個或多個檔案 (須在同一個資料夾)，任一個變動就呼叫 callback；只給一個資料夾時監看裡面所有檔案"""
+    def __init__(self, paths, callback, debounce=0.3, poll_interval=1.0):
+        super().__init__(daemon=True)
+        self.paths = [paths] if isinstance(paths, str) else [p for p in paths if p]
+        self.directory = self.paths[0] if len(self.paths) == 1 and os.path.isdir(self.paths[0]) else None
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+
+    def stop(self):
+        self._stop_event.set()
+        os.write(self._wake_w, b'x')
+
+    def run(self):
+        fd = _inotify_watch(self.directory or os.path.dirname(self.paths[0]) or '.')
+        try:
+            if fd is None:
+                self._run_poll()
+            else:
+                self._run_inotify(fd)
+        finally:
+            if fd is not None:
+                os.close(fd)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+
+    def _notify(self):
+        try:
+            self.callback()
+        except Exception:
+            pass
+
+    def _run_inotify(self, fd):
+        filenames = {os.fsencode(os.path.basename(p)) for p in self.paths}
+        pending = False
+        while not self._stop_event.is_set():
+            # 沒有待處理事件時無限期阻塞，閒置時完全不耗 CPU
+            timeout = self.debounce if pending else None
+            ready, _, _ = select.select([fd, self._wake_r], [], [], timeout)
+            if self._wake_r in ready:
+                break
+            if not ready:
+                pending = False
+                self._notify()
+                continue
+
+            buf = os.read(fd, 64 * 1024)
+            offset = 0
+            while offset + _INOTIFY_EVENT.size <= len(buf):
+                _, _, _, name_len = _INOTIFY_EVENT.unpack_from(buf, offset)
+                start = offset + _INOTIFY_EVENT.size
+                name = buf[start:start + name_len].rstrip(b'\0')
+                offset = start + name_len
+                if self.directory is not None or name in filenames:
+                    pending = True
+
+    def _stat(self):
+        if self.directory is not None:
+            try:
+                return sorted((f, _stat_key(os.path.join(self.directory, f))) for f in os.listdir(self.directory))
+            except OSError:
+                return None
+        return [_stat_key(p) for p in self.paths]
+
+    def _run_poll(self):
+        last = self._stat()
+        changed_at = None
+        while not self._stop_event.wait(self.debounce if changed_at else self.poll_interval):
+            current = self._stat()
+            if current != last:
+                last = current
+                changed_at = time.monotonic()
+            elif changed_at is not None and time.monotonic() - changed_at >= self.debounce:
+                changed_at = None
+                self._notify()
+
+def push_update(window, api):
+    """背景解析完成 (或讀取失敗) 時呼叫：把新資料或「顯示舊名單」的提示推送到頁面"""
+    if api.update_mode != "push":
+        return
+    previous, was_stale = api.client_version, api.client_stale
+    response = api.get_data(previous)
+    if api.client_version == previous and api.last_error is None and not was_stale:
+        # 內容沒變，畫面上也沒有「讀取失敗」的提示要清掉：不用推送
+        return
+    window.evaluate_js(f"receiveData({json.dumps(response)})")
+
 # --- HTML/CSS/JS (優化版：強化獎項一體性) ---
 html_content = """
 <!DOCTYPE html>
@@ -334,6 +2147,22 @@ html_content = """
             pointer-events: none; transform: rotate(-15deg);
         }
 
+        /* 畫質分級 (見 applyQuality)：一級關陰影，二級再關浮水印，三級再關漸層背景 */
+        body.q-no-shadow .sidebar,
+        body.q-no-shadow .prize-section,
+        body.q-no-shadow .prize-header,
+        body.q-no-shadow .winner-card { box-shadow: none; }
+        body.q-no-shadow .main-title,
+        body.q-no-shadow .prize-header h2 { text-shadow: none; }
+        body.q-no-watermark .winner-card::after { display: none; }
+        body.q-flat .main-content { background-image: none; }
+        body.q-flat .sidebar { background: #800000; }
+        body.q-flat .prize-header { background: #9a0000; }
+
+        /* 大量名單 (虛擬捲動)：區塊高度照算，只放可視範圍附近的卡片 */
+        #content-wrapper.virtual .winner-grid { display: block; position: relative; }
+        #content-wrapper.virtual .winner-card { position: absolute; }
+
         /* ----------------------------------------------------
            控制區
            ---------------------------------------------------- */
@@ -350,6 +2179,32 @@ html_content = """
         }
         .btn-fullscreen:hover { transform: scale(1.05); background: #a30000; }
         
+        #debug-overlay {
+            margin: 0 0 5px 0; padding: 8px 10px; border-radius: 6px;
+            background: rgba(0,0,0,0.75); color: #9f9; font: 11px/1.4 Consolas, monospace;
+            text-align: left; white-space: pre;
+        }
+        #quick-entry {
+            margin: 0 0 5px 0; padding: 10px; border-radius: 8px; width: 260px;
+            background: rgba(0,0,0,0.8); border: 1px solid var(--gold-accent);
+            display: flex; flex-wrap: wrap; gap: 6px; text-align: left;
+        }
+        #quick-entry[hidden] { display: none; }
+        #quick-entry input { flex: 1 1 100px; min-width: 0; padding: 6px 8px; border-radius: 4px; border: none; font-size: 0.95rem; }
+        #quick-entry button { padding: 6px 10px; border-radius: 4px; border: 1px solid white; background: #c0392b; color: white; cursor: pointer; }
+        #quick-result { flex-basis: 100%; font-size: 0.85rem; color: #fff; min-height: 1.2em; }
+        #quick-result.error { color: #ffb3b3; }
+        #search-box {
+            margin: 0 0 5px 0; padding: 10px; border-radius: 8px; width: 340px;
+            background: rgba(0,0,0,0.8); border: 1px solid var(--gold-accent); text-align: left;
+        }
+        #search-box[hidden] { display: none; }
+        #search-input { width: 100%; box-sizing: border-box; padding: 6px 8px; border-radius: 4px; border: none; font-size: 1rem; }
+        #search-results { list-style: none; margin: 6px 0 0 0; padding: 0; max-height: 50vh; overflow-y: auto; }
+        #search-results li { padding: 4px 6px; border-radius: 4px; color: #fff; font-size: 0.9rem; cursor: pointer; }
+        #search-results li.active { background: #c0392b; }
+        #search-results li.muted { color: rgba(255,255,255,0.6); cursor: default; }
+        .winner-card.search-hit, .prize-section.search-hit { outline: 4px solid var(--gold-accent); outline-offset: 2px; }
         #status-bar { font-size: 11px; color: rgba(255,255,255,0.7); margin-bottom: 5px; text-shadow: 0 1px 2px #000;}
         .error-msg { color: #fff; font-size: 1.5rem; text-align: center; margin-top: 100px; }
     </style>
@@ -375,126 +2230,591 @@ html_content = """
         </main>
         
         <div id="controls-area">
+            <pre id="debug-overlay" hidden></pre>
+            <form id="quick-entry" hidden autocomplete="off">
+                <input id="quick-award" list="quick-awards" placeholder="獎項">
+                <datalist id="quick-awards"></datalist>
+                <input id="quick-id" placeholder="工號">
+                <button type="submit">加入</button>
+                <button type="button" id="quick-export">匯出 Excel</button>
+                <div id="quick-result"></div>
+            </form>
+            <form id="search-box" hidden autocomplete="off">
+                <input id="search-input" placeholder="搜尋工號、姓名或獎項">
+                <ul id="search-results"></ul>
+            </form>
             <div id="status-bar"></div>
             <button class="btn-fullscreen" onclick="callFullScreen()">⛶ 全螢幕 (F)</button>
         </div>
 
     </div>
 
+    <script id="initial-data" type="application/json"></script>
     <script>
         let refreshRate = 5000;
-        let scrollSpeed = 1.5;
-        let isScrolling = true;
-        let scrollDirection = 1;
-        let currentScrollPos = 0;
-        let lastDataHash = "";
+        let scrollSpeed = 1.5;      // Excel 的「滾動速度」：以 60 fps 計的每幀像素
+        let dataVersion = null;
+        let lastUpdated = null;
+        let updateMode = 'poll';
         let timer = null;
-        let scrollFrame = null;
+        let currentData = {};       // 畫面上的名單 (獎項 -> { names, depts, ids } 平行陣列)
+        const COLUMNS_VERSION = 1;  // 對應 Python 的 COLUMNS_VERSION
+        const sectionMap = new Map(); // 獎項 -> { section, grid, count, cards, top }
+
+        // 虛擬捲動：得獎人數超過門檻時只保留可視範圍附近的卡片，其餘回收重用
+        const CARD_MIN_WIDTH = 280;   // 與 .winner-grid 的 minmax(280px, 1fr) 一致
+        const VIRTUAL_BUFFER = 800;   // 可視範圍上下多繪製的像素
+        let virtualThreshold = 2000;
+        let virtualMode = false;
+        let cardMetrics = null;
+        const cardPool = [];
+
+        // 效能統計：解析與繪製每次更新只多兩次 performance.now()；
+        // 影格時間與面板刷新只在除錯面板開啟時 (按 D 切換) 才進行
+        const PERF_WINDOW = 200;
+        const perfSamples = {};
+        let debugOverlay = false;
+        let debugTimer = null;
+
+        function perfRecord(stage, ms) {
+            let samples = perfSamples[stage];
+            if (!samples) samples = perfSamples[stage] = [];
+            samples.push(ms);
+            if (samples.length > PERF_WINDOW) samples.shift();
+        }
+
+        function perfSummary() {
+            const out = {};
+            Object.keys(perfSamples).forEach(stage => {
+                const ordered = perfSamples[stage].slice().sort((a, b) => a - b);
+                const n = ordered.length;
+                out[stage] = {
+                    count: n,
+                    p50: ordered[Math.floor(n / 2)],
+                    p95: ordered[Math.min(n - 1, Math.floor(n * 0.95))],
+                    max: ordered[n - 1]
+                };
+            });
+            return out;
+        }
+
+        function formatStats(title, stats) {
+            const lines = [title];
+            Object.keys(stats).forEach(stage => {
+                const s = stats[stage];
+                lines.push(stage.padEnd(14) + s.p50.toFixed(1).padStart(8) + s.p95.toFixed(1).padStart(8) +
+                           s.max.toFixed(1).padStart(8) + ('  (' + s.count + ')'));
+            });
+            return lines.join('\\n');
+        }
+
+        function refreshDebugOverlay() {
+            pywebview.api.get_stats().then(response => {
+                const py = JSON.parse(response).python;
+                const header = 'stage'.padEnd(14) + 'p50'.padStart(8) + 'p95'.padStart(8) + 'max'.padStart(8) + '  ms';
+                const tier = 'quality ' + quality.level + (quality.mode === 'auto' ? ' (auto)' : ' (fixed)');
+                document.getElementById('debug-overlay').textContent =
+                    header + '\\n' + formatStats('[python]', py) + '\\n' + formatStats('[page]', perfSummary()) + '\\n' + tier;
+            });
+        }
+
+        function toggleDebugOverlay() {
+            debugOverlay = !debugOverlay;
+            document.getElementById('debug-overlay').hidden = !debugOverlay;
+            if (debugTimer) clearInterval(debugTimer);
+            debugTimer = null;
+            if (debugOverlay) {
+                refreshDebugOverlay();
+                debugTimer = setInterval(refreshDebugOverlay, 1000);
+            }
+        }
 
         window.addEventListener('pywebviewready', function() {
             updateData();
-            initResizer();
         });
 
         function updateData() {
-            pywebview.api.get_data().then(function(response) {
-                const res = JSON.parse(response);
-                
-                if (res.error) {
-                    document.getElementById('content-wrapper').innerHTML = `<div class='error-msg'>${res.error}</div>`;
-                    setTimeout(updateData, 3000);
+            if (!window.pywebview || !pywebview.api) return;  // 尚未就緒：pywebviewready 時會再呼叫
+            const start = performance.now();
+            pywebview.api.get_data(dataVersion).then(response => {
+                perfRecord('bridge', performance.now() - start);
+                handleResponse(response);
+            });
+        }
+
+        // 推送模式：Python 監看到檔案變更後直接呼叫這裡
+        window.receiveData = function(response) {
+            handleResponse(response);
+        };
+
+        function scheduleNext(delay) {
+            if (timer) clearTimeout(timer);
+            timer = setTimeout(updateData, delay);
+        }
+
+        function handleResponse(response) {
+            let start = performance.now();
+            const res = JSON.parse(response);
+            perfRecord('json_parse', performance.now() - start);
+
+            // 檔案沒有變更：不重繪，只排下一次檢查
+            if (res.status === 'not_modified') {
+                updateStatus(res);
+                if (updateMode === 'poll') scheduleNext(refreshRate);
+                return;
+            }
+            
+            if (res.error) {
+                document.getElementById('content-wrapper').innerHTML = `<div class='error-msg'>${escapeHTML(res.error)}</div>`;
+                scheduleNext(3000);
+                return;
+            }
+
+            if (res.status === 'success' || res.status === 'delta') {
+                if (res.status === 'delta' && res.base !== dataVersion) {
+                    // 差異的基準版本和畫面不同：改拿完整資料
+                    dataVersion = null;
+                    updateData();
                     return;
                 }
-
-                if (res.status === 'success') {
-                    if(res.meta) {
-                        document.getElementById('main-title').innerText = res.meta.title;
-                        document.getElementById('sub-title').innerText = res.meta.subtitle || "";
-                        scrollSpeed = res.meta.scroll_speed;
-                        let newRate = res.meta.refresh_rate || 5000;
-                        if (newRate !== refreshRate) refreshRate = newRate;
-                    }
-                    renderUI(res.data);
-                    
-                    const now = new Date();
-                    document.getElementById('status-bar').innerText = "最後更新: " + now.getHours().toString().padStart(2,'0') + ":" + now.getMinutes().toString().padStart(2,'0') + ":" + now.getSeconds().toString().padStart(2,'0');
-                    
-                    if (timer) clearTimeout(timer);
-                    timer = setTimeout(updateData, refreshRate);
+                if(res.meta) {
+                    document.getElementById('main-title').innerText = res.meta.title;
+                    document.getElementById('sub-title').innerText = res.meta.subtitle || "";
+                    scrollSpeed = res.meta.scroll_speed;
+                    let newRate = res.meta.refresh_rate || 5000;
+                    if (newRate !== refreshRate) refreshRate = newRate;
+                    updateMode = res.meta.update_mode || 'poll';
+                    if (res.meta.virtual_threshold) virtualThreshold = res.meta.virtual_threshold;
+                    setQualityMode(res.meta.quality, res.meta.frame_budget);
                 }
+                dataVersion = res.version;
+                start = performance.now();
+                if (res.status === 'delta') applyDelta(res);
+                else renderUI(res.columns ? decodeColumns(res.columns) : decodeObjects(res.data));
+                perfRecord(res.status === 'delta' ? 'apply_delta' : 'render', performance.now() - start);
+                
+                lastUpdated = new Date();
+                updateStatus(res);
+                
+                // 推送模式不輪詢，等 Python 通知；輪詢模式維持原本的定時讀取
+                if (timer) clearTimeout(timer);
+                if (updateMode === 'poll') scheduleNext(refreshRate);
+            }
+        }
+
+        // 狀態列：最新讀取失敗時 (stale) 提示畫面上是上一份名單
+        function updateStatus(res) {
+            const bar = document.getElementById('status-bar');
+            if (res.stale) {
+                bar.innerText = "⚠ Excel 讀取失敗，顯示上次的名單 (" + res.stale + ")";
+            } else if (lastUpdated) {
+                const now = lastUpdated;
+                bar.innerText = "最後更新: " + now.getHours().toString().padStart(2,'0') + ":" + now.getMinutes().toString().padStart(2,'0') + ":" + now.getSeconds().toString().padStart(2,'0');
+            }
+        }
+
+        // 欄式名單直接切成每個獎項的平行陣列，不為每位得獎者建立物件
+        function decodeColumns(c) {
+            if (c.v !== COLUMNS_VERSION) throw new Error('不支援的名單格式版本: ' + c.v);
+            const data = {};
+            let start = 0;
+            c.awards.forEach((award, i) => {
+                const end = start + c.counts[i];
+                const depts = new Array(end - start);
+                for (let j = start; j < end; j++) depts[j - start] = c.depts[c.dept[j]];
+                data[award] = { names: c.names.slice(start, end), depts: depts, ids: c.ids.slice(start, end) };
+                start = end;
+            });
+            return data;
+        }
+
+        // 舊的物件格式 ({name, dept, empId} 陣列)，差異更新的 items 也是這個格式
+        function groupFromItems(items) {
+            const group = { names: [], depts: [], ids: [] };
+            items.forEach(p => {
+                group.names.push(p.name);
+                group.depts.push(p.dept);
+                group.ids.push(p.empId);
+            });
+            return group;
+        }
+
+        function decodeObjects(data) {
+            const result = {};
+            for (const award in data) result[award] = groupFromItems(data[award]);
+            return result;
+        }
+
+        // Excel 裡的文字一律跳脫後才拼進 HTML，顯示才會和 fillCard (textContent) 一致；瀏覽器模式會在區網上提供這個頁面
+        const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+        function escapeHTML(value) {
+            return String(value).replace(/[&<>"']/g, c => HTML_ESCAPES[c]);
+        }
+
+        function cardHTML(name, dept, empId) {
+            return `
+                        <div class="winner-card">
+                            <div class="winner-info">
+                                <div class="winner-id">${escapeHTML(name)}</div>
+                                <div class="winner-dept">${escapeHTML(dept)}</div>
+                            </div>
+                            <div class="winner-number">${escapeHTML(empId)}</div>
+                        </div>`;
+        }
+
+        function groupHTML(group) {
+            let html = '';
+            for (let i = 0; i < group.names.length; i++) html += cardHTML(group.names[i], group.depts[i], group.ids[i]);
+            return html;
+        }
+
+        function sectionHTML(award, cards, count) {
+            return `
+                <section class="prize-section">
+                    <div class="prize-header">
+                        <h2>${escapeHTML(award)}</h2>
+                        <span class="prize-count">共 ${count} 位</span>
+                    </div>
+                    <div class="winner-grid">${cards}</div></section>`;
+        }
+
+        function indexSection(award, section) {
+            sectionMap.set(award, {
+                section: section,
+                grid: section.querySelector('.winner-grid'),
+                count: section.querySelector('.prize-count'),
+                cards: new Map(),   // 虛擬模式：名單索引 -> 卡片元素
+                top: 0
             });
         }
 
+        function totalWinners(data) {
+            let total = 0;
+            for (const award in data) total += data[award].names.length;
+            return total;
+        }
+
         function renderUI(groupedData) {
-            const currentHash = JSON.stringify(groupedData);
-            if (currentHash === lastDataHash) return;
-            lastDataHash = currentHash;
-            
             const wrapper = document.getElementById('content-wrapper');
-            let html = "";
             const awards = Object.keys(groupedData);
+            currentData = groupedData;
+            sectionMap.clear();
 
             if (awards.length === 0) {
+                wrapper.classList.remove('virtual');
                 wrapper.innerHTML = "<div class='error-msg'>目前沒有得獎名單，請確認 Excel。</div>";
                 return;
             }
 
-            awards.forEach(award => {
-                const list = groupedData[award];
-                html += `
-                <section class="prize-section">
-                    <div class="prize-header">
-                        <h2>${award}</h2>
-                        <span class="prize-count">共 ${list.length} 位</span>
-                    </div>
-                    <div class="winner-grid">`;
-                list.forEach(p => {
-                    html += `
-                        <div class="winner-card">
-                            <div class="winner-info">
-                                <div class="winner-id">${p.name}</div>
-                                <div class="winner-dept">${p.dept}</div>
-                            </div>
-                            <div class="winner-number">${p.empId}</div>
-                        </div>`;
+            virtualMode = totalWinners(groupedData) > virtualThreshold;
+            wrapper.classList.toggle('virtual', virtualMode);
+            wrapper.innerHTML = awards.map(award => {
+                const group = groupedData[award];
+                return sectionHTML(award, virtualMode ? '' : groupHTML(group), group.names.length);
+            }).join('');
+            wrapper.querySelectorAll('.prize-section').forEach((section, i) => indexSection(awards[i], section));
+            if (virtualMode) layoutVirtual();
+            setTimeout(() => { refreshScroll(); }, 100);
+        }
+
+        function createCard() {
+            const card = document.createElement('div');
+            card.className = 'winner-card';
+            card.innerHTML = cardHTML('', '', '');
+            card.nameEl = card.querySelector('.winner-id');
+            card.deptEl = card.querySelector('.winner-dept');
+            card.idEl = card.querySelector('.winner-number');
+            return card;
+        }
+
+        function fillCard(card, name, dept, empId) {
+            card.nameEl.textContent = name;
+            card.deptEl.textContent = dept;
+            card.idEl.textContent = empId;
+        }
+
+        function releaseCard(card) {
+            card.classList.remove('search-hit');
+            card.remove();
+            cardPool.push(card);
+        }
+
+        // 量測卡片尺寸並設定每個獎項區塊的完整高度 (sticky 標題與捲到底的判斷因此不變)
+        function layoutVirtual() {
+            if (!virtualMode || sectionMap.size === 0) return;
+            const first = sectionMap.values().next().value;
+            const style = getComputedStyle(first.grid);
+            const padTop = parseFloat(style.paddingTop);
+            const padLeft = parseFloat(style.paddingLeft);
+            const gap = parseFloat(style.rowGap) || 20;
+            const inner = first.grid.clientWidth - padLeft - parseFloat(style.paddingRight);
+            const cols = Math.max(1, Math.floor((inner + gap) / (CARD_MIN_WIDTH + gap)));
+            const width = (inner - gap * (cols - 1)) / cols;
+
+            const probe = cardPool.pop() || createCard();
+            fillCard(probe, '王小明', '資訊部', '000000');
+            probe.style.width = width + 'px';
+            probe.style.visibility = 'hidden';
+            first.grid.appendChild(probe);
+            const height = probe.offsetHeight;
+            probe.style.visibility = '';
+            releaseCard(probe);
+
+            cardMetrics = { cols: cols, width: width, rowH: height + gap, gap: gap, padTop: padTop, padLeft: padLeft };
+            sectionMap.forEach((entry, award) => {
+                const rows = Math.ceil(currentData[award].names.length / cols);
+                const body = rows > 0 ? rows * cardMetrics.rowH - gap : 0;
+                entry.grid.style.height = (body + padTop * 2) + 'px';
+                entry.cards.forEach(releaseCard);
+                entry.cards.clear();
+            });
+            // 高度全部設定好之後再一次讀取位置
+            sectionMap.forEach(entry => { entry.top = entry.section.offsetTop + entry.grid.offsetTop; });
+            updateVirtualWindow();
+        }
+
+        function updateVirtualWindow() {
+            if (!virtualMode || !cardMetrics) return;
+            const container = document.getElementById('main-scroll-area');
+            const m = cardMetrics;
+            const viewTop = container.scrollTop - VIRTUAL_BUFFER;
+            const viewBottom = container.scrollTop + container.clientHeight + VIRTUAL_BUFFER;
+
+            sectionMap.forEach((entry, award) => {
+                const group = currentData[award];
+                const total = group.names.length;
+                const start = viewTop - entry.top - m.padTop;
+                const end = viewBottom - entry.top - m.padTop;
+                const from = Math.min(total, Math.max(0, Math.floor(start / m.rowH)) * m.cols);
+                const to = end > 0 ? Math.min(total, Math.ceil(end / m.rowH) * m.cols) : 0;
+
+                entry.cards.forEach((card, index) => {
+                    if (index < from || index >= to) {
+                        releaseCard(card);
+                        entry.cards.delete(index);
+                    }
                 });
-                html += `</div></section>`;
+                for (let i = from; i < to; i++) {
+                    if (entry.cards.has(i)) continue;
+                    const card = cardPool.pop() || createCard();
+                    fillCard(card, group.names[i], group.depts[i], group.ids[i]);
+                    card.style.width = m.width + 'px';
+                    card.style.left = (m.padLeft + (i % m.cols) * (m.width + m.gap)) + 'px';
+                    card.style.top = (m.padTop + Math.floor(i / m.cols) * m.rowH) + 'px';
+                    entry.grid.appendChild(card);
+                    entry.cards.set(i, card);
+                }
             });
-            
-            wrapper.innerHTML = html;
-            setTimeout(() => { checkAndStartScroll(); }, 100);
         }
 
-        function checkAndStartScroll() {
+        function initScrollArea() {
             const container = document.getElementById('main-scroll-area');
-            if (scrollFrame) cancelAnimationFrame(scrollFrame);
-            
-            if (container.scrollHeight > container.clientHeight) {
-                isScrolling = true;
-                currentScrollPos = container.scrollTop;
-                scrollLoop();
-            }
+            container.addEventListener('scroll', () => { if (virtualMode) updateVirtualWindow(); }, { passive: true });
+            window.addEventListener('resize', () => {
+                if (virtualMode) layoutVirtual();
+                refreshScroll();
+            });
         }
 
-        function scrollLoop() {
+        // 只修補有變動的獎項：刪除/插入對應的卡片、更新人數，保留目前的捲動位置
+        function applyDelta(res) {
+            const wrapper = document.getElementById('content-wrapper');
             const container = document.getElementById('main-scroll-area');
-            if (isScrolling) {
-                currentScrollPos += (scrollSpeed * scrollDirection);
-                container.scrollTop = currentScrollPos;
-                
-                if (scrollDirection === 1 && (currentScrollPos + container.clientHeight >= container.scrollHeight - 2)) {
-                    isScrolling = false;
-                    setTimeout(() => { scrollDirection = -1; isScrolling = true; scrollFrame = requestAnimationFrame(scrollLoop); }, 3000);
-                    return;
+
+            const next = {};
+            const empty = { names: [], depts: [], ids: [] };
+            res.order.forEach(award => { next[award] = currentData[award] || empty; });
+            Object.keys(res.changes).forEach(award => {
+                const ch = res.changes[award];
+                const group = next[award];
+                const items = groupFromItems(ch.items);
+                const splice = key => group[key].slice(0, ch.start).concat(items[key], group[key].slice(ch.start + ch.remove));
+                next[award] = { names: splice('names'), depts: splice('depts'), ids: splice('ids') };
+            });
+            currentData = next;
+
+            // 畫面上目前是提示訊息、名單清空了，或人數跨過虛擬捲動門檻：直接完整重繪
+            if (res.order.length === 0 || sectionMap.size === 0 ||
+                (totalWinners(currentData) > virtualThreshold) !== virtualMode) {
+                renderUI(currentData);
+                return;
+            }
+
+            res.removed.forEach(award => {
+                const entry = sectionMap.get(award);
+                if (entry) entry.section.remove();
+                sectionMap.delete(award);
+            });
+
+            Object.keys(res.changes).forEach(award => {
+                const ch = res.changes[award];
+                if (!sectionMap.has(award)) {
+                    wrapper.insertAdjacentHTML('beforeend', sectionHTML(award, '', 0));
+                    indexSection(award, wrapper.lastElementChild);
                 }
-                if (scrollDirection === -1 && currentScrollPos <= 0) {
-                    currentScrollPos = 0; container.scrollTop = 0;
-                    isScrolling = false;
-                    setTimeout(() => { scrollDirection = 1; isScrolling = true; scrollFrame = requestAnimationFrame(scrollLoop); }, 3000);
-                    return;
+                const entry = sectionMap.get(award);
+                entry.count.textContent = `共 ${currentData[award].names.length} 位`;
+                if (virtualMode) return;   // 虛擬模式稍後由 layoutVirtual 重新排版
+
+                const cards = entry.grid.children;
+                if (ch.remove > 0) {
+                    const range = document.createRange();
+                    range.setStartBefore(cards[ch.start]);
+                    range.setEndAfter(cards[ch.start + ch.remove - 1]);
+                    range.deleteContents();
+                }
+                if (ch.items.length > 0) {
+                    const fragment = document.createRange().createContextualFragment(groupHTML(groupFromItems(ch.items)));
+                    entry.grid.insertBefore(fragment, cards[ch.start] || null);
+                }
+            });
+
+            res.order.forEach((award, i) => {
+                const section = sectionMap.get(award).section;
+                if (wrapper.children[i] !== section) wrapper.insertBefore(section, wrapper.children[i] || null);
+            });
+            if (virtualMode) layoutVirtual();
+
+            // 瀏覽器的捲動錨定可能調整了 scrollTop，同步回滾動位置
+            scroller.pos = container.scrollTop;
+            refreshScroll();
+        }
+
+        // 捲動排程器：依經過時間移動 (不受螢幕更新率影響)，同一時間只會有一個 rAF 迴圈。
+        // 使用者暫停、內容不需捲動、或停在兩端的 3 秒內都不排任何 rAF。
+        // 每幀只寫入 scrollTop，尺寸在排版變動時才量測，避免每幀強制重新排版。
+        const scrollArea = document.getElementById('main-scroll-area');
+        const scroller = {
+            frame: null,        // 目前排定的 requestAnimationFrame
+            endTimer: null,     // 兩端停留的計時器
+            paused: false,      // 空白鍵暫停
+            direction: 1,
+            pos: 0,
+            lastTime: null,
+            maxScroll: 0        // 快取 scrollHeight - clientHeight
+        };
+
+        function measureScroll() {
+            scroller.maxScroll = Math.max(0, scrollArea.scrollHeight - scrollArea.clientHeight);
+        }
+
+        function startScroll() {
+            if (scroller.paused || scroller.frame || scroller.endTimer || scroller.maxScroll <= 0) return;
+            scroller.pos = scrollArea.scrollTop;
+            scroller.lastTime = null;
+            scroller.frame = requestAnimationFrame(scrollStep);
+        }
+
+        function stopScroll() {
+            if (scroller.frame) cancelAnimationFrame(scroller.frame);
+            if (scroller.endTimer) clearTimeout(scroller.endTimer);
+            scroller.frame = null;
+            scroller.endTimer = null;
+        }
+
+        // 內容變動後呼叫：重新量測，需要捲動就啟動，不需要就停下
+        function refreshScroll() {
+            measureScroll();
+            if (scroller.maxScroll > 0) {
+                scroller.pos = Math.min(scroller.pos, scroller.maxScroll);
+                startScroll();
+            } else {
+                stopScroll();
+            }
+        }
+
+        function pauseAtEnd(nextDirection) {
+            scroller.endTimer = setTimeout(() => {
+                scroller.endTimer = null;
+                scroller.direction = nextDirection;
+                startScroll();
+            }, 3000);
+        }
+
+        function scrollStep(now) {
+            scroller.frame = null;
+            if (scroller.lastTime !== null) {
+                const frameMs = now - scroller.lastTime;
+                if (debugOverlay) perfRecord('frame', frameMs);
+                qualitySample(frameMs);
+            }
+            if (scroller.lastTime === null) scroller.lastTime = now;
+            // 視窗被切走後回來時不要一次跳太遠
+            const elapsed = Math.min(now - scroller.lastTime, 100) / 1000;
+            scroller.lastTime = now;
+            scroller.pos += scrollSpeed * 60 * elapsed * scroller.direction;
+
+            if (scroller.direction === 1 && scroller.pos >= scroller.maxScroll - 2) {
+                scroller.pos = scroller.maxScroll;
+                scrollArea.scrollTop = scroller.pos;
+                pauseAtEnd(-1);
+                return;
+            }
+            if (scroller.direction === -1 && scroller.pos <= 0) {
+                scroller.pos = 0;
+                scrollArea.scrollTop = 0;
+                pauseAtEnd(1);
+                return;
+            }
+            scrollArea.scrollTop = scroller.pos;
+            scroller.frame = requestAnimationFrame(scrollStep);
+        }
+
+        // 畫質分級：捲動時取樣每幀間隔，p95 超過預算就依序關掉陰影、浮水印、漸層背景；
+        // 連續幾輪都很寬裕再升回一級。升級後馬上又掉下來，下次就要等更久才再試 (避免來回閃動)。
+        const QUALITY_CLASSES = ['q-no-shadow', 'q-no-watermark', 'q-flat'];
+        const QUALITY_SAMPLES = 120;        // 每輪取樣幾幀
+        const QUALITY_MAX_ROUNDS = 160;
+        const quality = {
+            mode: 'auto',       // 'auto' 或固定級數 0 ~ 3 (系統設定「畫質」)
+            level: 0,           // 0 = 全開，數字越大關掉越多效果
+            budget: 0,          // 每幀預算 (ms)，0 = 依螢幕更新間隔 × 1.5
+            interval: Infinity, // 量到的螢幕更新間隔 (每輪第 10 百分位的最小值)
+            samples: [],
+            goodRounds: 0,
+            recoverRounds: 5,   // 連續幾輪寬裕才升一級
+            justRaised: false
+        };
+
+        function applyQuality(level) {
+            quality.level = level;
+            QUALITY_CLASSES.forEach((cls, i) => document.body.classList.toggle(cls, i < level));
+        }
+
+        function setQualityMode(mode, budget) {
+            quality.budget = budget || 0;
+            if (mode === undefined || mode === quality.mode) return;
+            quality.mode = mode;
+            quality.samples = [];
+            applyQuality(mode === 'auto' ? 0 : mode);
+        }
+
+        function qualitySample(ms) {
+            if (quality.mode !== 'auto' || ms > 250) return;   // 視窗被切走的空檔不算
+            quality.samples.push(ms);
+            if (quality.samples.length < QUALITY_SAMPLES) return;
+
+            const ordered = quality.samples.sort((a, b) => a - b);
+            quality.samples = [];
+            quality.interval = Math.min(quality.interval, ordered[Math.floor(ordered.length * 0.1)]);
+            const p95 = ordered[Math.floor(ordered.length * 0.95)];
+            const budget = quality.budget || quality.interval * 1.5;
+            const raised = quality.justRaised;
+            quality.justRaised = false;
+
+            if (p95 > budget) {
+                quality.goodRounds = 0;
+                if (raised) quality.recoverRounds = Math.min(quality.recoverRounds * 2, QUALITY_MAX_ROUNDS);
+                if (quality.level < QUALITY_CLASSES.length) applyQuality(quality.level + 1);
+            } else if (p95 < budget * 0.75 && quality.level > 0) {
+                if (++quality.goodRounds >= quality.recoverRounds) {
+                    quality.goodRounds = 0;
+                    quality.justRaised = true;
+                    applyQuality(quality.level - 1);
                 }
+            } else {
+                quality.goodRounds = 0;
             }
-            scrollFrame = requestAnimationFrame(scrollLoop);
         }
 
         function initResizer() {
@@ -529,28 +2849,437 @@ html_content = """
             pywebview.api.toggle_fullscreen();
         }
 
+        // 快速輸入 (N)：輸入獎項與工號，直接寫進抽獎紀錄檔，不必在 Excel 存檔
+        const quickEntry = document.getElementById('quick-entry');
+
+        function showQuickResult(text, isError) {
+            const el = document.getElementById('quick-result');
+            el.textContent = text;
+            el.classList.toggle('error', !!isError);
+        }
+
+        function toggleQuickEntry() {
+            quickEntry.hidden = !quickEntry.hidden;
+            if (quickEntry.hidden) return;
+            document.getElementById('quick-awards').innerHTML =
+                Object.keys(currentData).map(award => `<option value="${escapeHTML(award)}">`).join('');
+            const awardInput = document.getElementById('quick-award');
+            (awardInput.value ? document.getElementById('quick-id') : awardInput).focus();
+        }
+
+        quickEntry.addEventListener('submit', (e) => {
+            e.preventDefault();
+            if (!window.pywebview || !pywebview.api.add_winner) {
+                showQuickResult('此模式不支援快速輸入', true);
+                return;
+            }
+            const idInput = document.getElementById('quick-id');
+            const start = performance.now();
+            pywebview.api.add_winner(document.getElementById('quick-award').value, idInput.value).then(response => {
+                perfRecord('add_winner', performance.now() - start);
+                const res = JSON.parse(response);
+                if (res.error) {
+                    showQuickResult(res.error, true);
+                    return;
+                }
+                showQuickResult(`✔ ${res.award}：${res.name} (${res.dept})`, false);
+                idInput.value = '';
+                idInput.focus();
+                // 推送模式由 Python 主動送來差異；輪詢模式自己馬上拿一次
+                if (updateMode !== 'push') updateData();
+            });
+        });
+
+        document.getElementById('quick-export').addEventListener('click', () => {
+            if (!window.pywebview || !pywebview.api.export_winners) return;
+            showQuickResult('匯出中...', false);
+            pywebview.api.export_winners().then(response => {
+                const res = JSON.parse(response);
+                if (res.error) showQuickResult(res.error, true);
+                else showQuickResult(`已匯出 ${res.count} 筆：${res.path}`, false);
+            });
+        });
+
+        // 搜尋 (S)：查詢 Python 端的索引，選到的結果捲動到該獎項並標示卡片 (自動捲動暫停，空白鍵繼續)
+        const searchBox = document.getElementById('search-box');
+        const searchInput = document.getElementById('search-input');
+        const searchList = document.getElementById('search-results');
+        const search = { seq: 0, results: [], active: 0, hit: null, hitTimer: null };
+
+        function toggleSearch() {
+            searchBox.hidden = !searchBox.hidden;
+            if (searchBox.hidden) return;
+            searchInput.select();
+            searchInput.focus();
+        }
+
+        function renderSearchResults() {
+            searchList.innerHTML = search.results.map((r, i) => {
+                const active = i === search.active ? ' class="active"' : '';
+                if (r.type === 'award') return `<li${active}>🏆 ${escapeHTML(r.award)}　共 ${r.count} 位</li>`;
+                const person = `${escapeHTML(r.empId)} ${escapeHTML(r.name)}　${escapeHTML(r.dept)}`;
+                if (r.type === 'winner') return `<li${active}>${person}　→ ${escapeHTML(r.award)}</li>`;
+                return `<li class="muted">${person}　尚未得獎</li>`;
+            }).join('') || (searchInput.value.trim() ? '<li class="muted">找不到符合的結果</li>' : '');
+        }
+
+        searchInput.addEventListener('input', () => {
+            if (!window.pywebview || !pywebview.api.search) return;
+            const seq = ++search.seq;
+            const start = performance.now();
+            pywebview.api.search(searchInput.value).then(response => {
+                if (seq !== search.seq) return;   // 已經有更新的輸入
+                perfRecord('search', performance.now() - start);
+                const res = JSON.parse(response);
+                search.results = res.results || [];
+                search.active = search.results.findIndex(r => r.type !== 'person');
+                renderSearchResults();
+            });
+        });
+
+        searchInput.addEventListener('keydown', (e) => {
+            if (e.key !== 'ArrowDown' && e.key !== 'ArrowUp') return;
+            e.preventDefault();
+            const step = e.key === 'ArrowDown' ? 1 : -1;
+            for (let i = search.active + step; i >= 0 && i < search.results.length; i += step) {
+                if (search.results[i].type !== 'person') { search.active = i; break; }
+            }
+            renderSearchResults();
+        });
+
+        searchList.addEventListener('click', (e) => {
+            const i = Array.prototype.indexOf.call(searchList.children, e.target.closest('li'));
+            if (i >= 0 && search.results[i] && search.results[i].type !== 'person') jumpTo(search.results[i]);
+        });
+
+        searchBox.addEventListener('submit', (e) => {
+            e.preventDefault();
+            if (search.results[search.active]) jumpTo(search.results[search.active]);
+        });
+
+        function jumpTo(result) {
+            const entry = sectionMap.get(result.award);
+            if (!entry) return;
+            scroller.paused = true;
+            stopScroll();
+
+            let target = entry.section;
+            let top = entry.section.offsetTop;
+            const index = result.type === 'winner' ? currentData[result.award].ids.indexOf(result.empId) : -1;
+            if (index >= 0 && virtualMode) {
+                // 虛擬模式：卡片位置用算的，捲過去之後才會有元素
+                top = entry.top + cardMetrics.padTop + Math.floor(index / cardMetrics.cols) * cardMetrics.rowH;
+                scrollArea.scrollTop = Math.max(0, top - scrollArea.clientHeight / 2);
+                updateVirtualWindow();
+                target = entry.cards.get(index) || target;
+            } else if (index >= 0) {
+                target = entry.grid.children[index];
+                const offset = target.getBoundingClientRect().top - scrollArea.getBoundingClientRect().top;
+                scrollArea.scrollTop = Math.max(0, scrollArea.scrollTop + offset - scrollArea.clientHeight / 2);
+            } else {
+                scrollArea.scrollTop = top;
+            }
+            scroller.pos = scrollArea.scrollTop;
+
+            if (search.hit) search.hit.classList.remove('search-hit');
+            clearTimeout(search.hitTimer);
+            search.hit = target;
+            target.classList.add('search-hit');
+            search.hitTimer = setTimeout(() => { target.classList.remove('search-hit'); search.hit = null; }, 5000);
+        }
+
         document.addEventListener('keydown', (e) => { 
+            // 在快速輸入或搜尋框打字時不觸發快捷鍵；Esc 關閉
+            if (e.target.tagName === 'INPUT') {
+                if (e.key === 'Escape') (searchBox.contains(e.target) ? toggleSearch : toggleQuickEntry)();
+                return;
+            }
+            if(e.key === 'n' || e.key === 'N') {
+                e.preventDefault();
+                toggleQuickEntry();
+            }
+            if(e.key === 's' || e.key === 'S') {
+                e.preventDefault();
+                toggleSearch();
+            }
             if(e.key === ' ') { 
-                isScrolling = !isScrolling; 
-                if(isScrolling) scrollLoop();
+                scroller.paused = !scroller.paused;
+                if (scroller.paused) stopScroll();
+                else startScroll();
             }
             if(e.key === 'f' || e.key === 'F') {
                 callFullScreen();
             }
+            if(e.key === 'd' || e.key === 'D') {
+                toggleDebugOverlay();
+            }
         });
+
+        initResizer();
+        initScrollArea();
+
+        // 啟動時嵌在頁面裡的上一份名單 (磁碟快取)：不等 pywebview 就緒，先畫出來。
+        // 畫完就移除標籤，整份 JSON 字串不會在頁面開著的幾個小時裡一直留在記憶體
+        const initialTag = document.getElementById('initial-data');
+        if (initialTag.textContent) handleResponse(initialTag.textContent);
+        initialTag.remove();
     </script>
 </body>
 </html>
 """
 
+INITIAL_DATA_TAG = '<script id="initial-data" type="application/json"></script>'
+
+def embed_payload(html, payload):
+    """把完整名單嵌進頁面，第一個畫面不用等 get_data"""
+    # "</" 轉成 JSON 中等價的 "<\/"，名單內容才不會提早結束 <script>
+    tag = '<script id="initial-data" type="application/json">' + payload.replace('</', '<\\/') + '</script>'
+    return html.replace(INITIAL_DATA_TAG, tag, 1)
+
+def initial_html(source):
+    """已有快照 (通常來自磁碟快取) 就直接嵌進視窗的頁面；沒有時不等第一次解析，先開「載入中...」"""
+    if not source.has_snapshot():
+        return html_content
+    return embed_payload(html_content, source.get_data())
+
+# --- 瀏覽器模式 (python main.py --serve) ---
+# 不開視窗，改由內建 HTTP 伺服器提供同一份頁面：活頁簿只解析一次，分送給多台螢幕的瀏覽器。
+#   GET /             看板頁面 (以 BROWSER_BRIDGE 取代 pywebview 橋接)
+#   GET /api/data     完整名單，支援 ETag / If-None-Match (304)；?since=版本 時回傳 get_data 的差異格式
+#   GET /api/events   SSE：名單更新或讀取失敗時推送，內容與 receiveData 收到的相同
+#   GET /api/stats    各階段耗時
+# 只接受本機與區域網路 (私有位址) 的連線。
+SSE_KEEPALIVE = 15  # 秒；沒有更新時定期送註解行，避免連線被中間設備切斷
+
+BROWSER_BRIDGE = """
+    <script>
+        // 瀏覽器模式：用 HTTP 取代 pywebview.api，用 SSE 取代 evaluate_js 推送
+        window.pywebview = {
+            api: {
+                get_data: version => fetch('/api/data?since=' + encodeURIComponent(version || ''), { cache: 'no-store' }).then(r => r.text()),
+                get_stats: () => fetch('/api/stats', { cache: 'no-store' }).then(r => r.text()),
+                search: query => fetch('/api/search?q=' + encodeURIComponent(query), { cache: 'no-store' }).then(r => r.text()),
+                toggle_fullscreen: () => document.fullscreenElement ? document.exitFullscreen() : document.documentElement.requestFullscreen()
+            }
+        };
+        new EventSource('/api/events?since=' + encodeURIComponent(dataVersion || '')).onmessage = e => receiveData(e.data);
+        window.dispatchEvent(new Event('pywebviewready'));
+    </script>
+</body>"""
+
+class Broadcaster:
+    """快照變動時叫醒所有 SSE 連線；同一個基準版本的回應只算一次，再分送給每個連線"""
+    def __init__(self, api):
+        self.api = api
+        self.seq = 0
+        self._cond = threading.Condition()
+        self._responses = {}
+        api.listeners.append(self.notify)
+
+    def notify(self):
+        with self._cond:
+            self.seq += 1
+            self._responses = {}
+            self._cond.notify_all()
+
+    def wait(self, seq, timeout):
+        """等到 seq 改變或逾時，回傳目前的 seq"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq != seq, timeout)
+            return self.seq
+
+    def response_for(self, base, stale=False):
+        """回傳 (回應, 版本, 回應是否帶 stale)；stale 是這個連線上次的回應是否帶 stale
+
+        畫面已是最新、沒有錯誤，也沒有「讀取失敗」的提示要清掉時回應是 None。
+        """
+        api = self.api
+        snapshot = api.snapshot
+        error = api.last_error
+        if snapshot is None:
+            return (json.dumps(error), base, False) if error else (None, base, False)
+        if base == snapshot.version and error is None and not stale:
+            return None, base, False
+        key = (snapshot.version, base)
+        with self._cond:
+            response = self._responses.get(key)
+        if response is None:
+            response = api.get_data(base)
+            with self._cond:
+                self._responses[key] = response
+        return response, snapshot.version, error is not None
+
+def _is_local_address(host):
+    import ipaddress
+    try:
+        addr = ipaddress.ip_address(host.split('%')[0])
+    except ValueError:
+        return False
+    if getattr(addr, 'ipv4_mapped', None):
+        addr = addr.ipv4_mapped
+    return addr.is_loopback or addr.is_private or addr.is_link_local
+
+class BoardRequestHandler:
+    """瀏覽器模式的請求處理；serve() 才把它接上 BaseHTTPRequestHandler (http.server 只在 --serve 時載入)"""
+    server_version = 'LuckyDraw'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if not _is_local_address(self.client_address[0]):
+            self.send_error(403, "只接受本機與區域網路的連線")
+            return
+        from urllib.parse import urlsplit, parse_qs
+        url = urlsplit(self.path)
+        query = parse_qs(url.query, keep_blank_values=True)
+        api = self.server.api
+        if url.path == '/':
+            payload = api.get_data()
+            html = embed_payload(html_content, payload) if api.snapshot else html_content
+            self._send(200, html.replace('</body>', BROWSER_BRIDGE, 1), 'text/html; charset=utf-8')
+        elif url.path == '/api/data':
+            if 'since' in query:
+                self._send(200, api.get_data(query['since'][0] or None), 'application/json')
+            else:
+                self._send_snapshot(api)
+        elif url.path == '/api/events':
+            self._stream(query.get('since', [''])[0] or None)
+        elif url.path == '/api/stats':
+            self._send(200, api.get_stats(), 'application/json')
+        elif url.path == '/api/search':
+            self._send(200, api.search(query.get('q', [''])[0]), 'application/json')
+        else:
+            self.send_error(404)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def _send(self, status, body, content_type, headers=()):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def _send_snapshot(self, api):
+        response = api.get_data()
+        snapshot = api.snapshot
+        if snapshot is None:
+            self._send(503, response, 'application/json')
+            return
+        # 版本就是內容雜湊，直接當 ETag；沒變時只回 304 不送本文
+        etag = f'"{snapshot.version}"'
+        if etag in (tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        data = response.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def _stream(self, version):
+        broadcaster = self.server.broadcaster
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        seq = None
+        stale = False
+        try:
+            while True:
+                current = broadcaster.wait(seq, SSE_KEEPALIVE)
+                if current == seq:
+                    self.wfile.write(b': keepalive\n\n')
+                else:
+                    seq = current
+                    response, version, stale = broadcaster.response_for(version, stale)
+                    if response is not None:
+                        self.wfile.write(b'data: ' + response.encode('utf-8') + b'\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass
+
+def serve(api, host, port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    handler = type('BoardRequestHandler', (BoardRequestHandler, BaseHTTPRequestHandler), {})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.api = api
+    server.broadcaster = Broadcaster(api)
+    print(f"看板網址: http://{host}:{port}/  (Ctrl+C 結束)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
 if __name__ == '__main__':
-    api = Api()
-    window = webview.create_window(
-        'Lucky Draw Board', 
-        html=html_content, 
-        js_api=api,
-        width=1280, 
-        height=800,
-        background_color='#800000'
-    )
+    import argparse
+    import multiprocessing
+    multiprocessing.freeze_support()    # 打包成執行檔時，行程池的子行程從這裡接手
+    parser = argparse.ArgumentParser(description='Lucky Draw Board')
+    parser.add_argument('--serve', action='store_true', help='不開視窗，以 HTTP 提供看板給瀏覽器 (多台螢幕共用一次解析)')
+    parser.add_argument('--host', default='127.0.0.1', help='瀏覽器模式的監聽位址 (區域網路請用 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=8765, help='瀏覽器模式的連接埠')
+    parser.add_argument('--sessions', metavar='資料夾', help='多場次模式：資料夾裡每本活頁簿是一個場次，平行解析')
+    parser.add_argument('--rotate', type=float, default=0, help='多場次模式每幾秒輪換一個場次 (0 表示合併顯示)')
+    args, _ = parser.parse_known_args()
+
+    if args.sessions:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=max(2, os.cpu_count() or 1))
+        board = SessionBoard(args.sessions, pool, args.rotate)
+        board.scan()
+        api = SessionView(board)
+        watcher = FileWatcher(board.directory, board.request_refresh)
+    else:
+        api = Api(cache_path=get_cache_path(), journal_path=get_journal_path())
+        api.request_refresh()  # 視窗啟動的同時就在背景驗證/重新解析
+        watcher = FileWatcher([api.file_path, api.journal_path], api.request_refresh)
+    watcher.start()
+
+    if args.serve:
+        serve(api, args.host, args.port)
+        sys.exit(0)
+
+    import webview
+
+    # 有「視窗N-...」設定就每個設定開一個視窗，否則維持單一視窗。
+    # 視窗數量只讀系統設定工作表決定：磁碟快取裡可能是舊設定，也不必等完整解析
+    settings = [] if args.sessions else read_window_settings(api.file_path)
+    if settings:
+        sources = [BoardView(api, i) for i in range(len(settings))]
+    else:
+        sources = [api]
+
+    for i, source in enumerate(sources):
+        window = webview.create_window(
+            'Lucky Draw Board' if len(sources) == 1 else f'Lucky Draw Board ({i + 1})', 
+            html=initial_html(source), 
+            js_api=source,
+            width=1280, 
+            height=800,
+            background_color='#800000'
+        )
+        if source is not api or args.sessions:
+            source._window = window
+        api.listeners.append(lambda window=window, source=source: push_update(window, source))
     webview.start(debug=False)
\ No newline at end of file
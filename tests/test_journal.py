@@ -0,0 +1,95 @@
+"""抽獎紀錄檔：parse_journal_line 與 DrawJournal.read_new"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+
+
+def test_parse_csv_lines():
+    assert main.parse_journal_line(b"\xe9\xa0\xad\xe7\x8d\x8e,A002\n") == ("頭獎", "A002", "", "")
+    assert main.parse_journal_line("特別獎, A003 ,王小明,資訊部\r\n".encode()) == ("特別獎", "A003", "王小明", "資訊部")
+    # 欄位比四個多時只取前四個
+    assert main.parse_journal_line("頭獎,A004,甲,乙,備註".encode()) == ("頭獎", "A004", "甲", "乙")
+
+
+def test_parse_json_lines_and_aliases():
+    line = json.dumps({"award": "頭獎", "empId": "A001"}).encode()
+    assert main.parse_journal_line(line) == ("頭獎", "A001", "", "")
+    line = json.dumps({"獎項": "二獎", "工號": 42, "姓名": "李四", "單位": "業務部"}, ensure_ascii=False).encode()
+    assert main.parse_journal_line(line) == ("二獎", "42", "李四", "業務部")
+    # 英文鍵優先於中文別名
+    line = json.dumps({"award": "三獎", "獎項": "四獎", "empId": "A5"}, ensure_ascii=False).encode()
+    assert main.parse_journal_line(line) == ("三獎", "A5", "", "")
+
+
+def test_parse_skips_blank_comment_header_and_bad_lines():
+    for line in (b"", b"   \r\n", "# 第二輪".encode(), "獎項,工號,姓名,單位".encode(),
+                 b'{"award": ', b'{"award": "", "empId": "A1"}', b",A001", json.dumps({"empId": "A1"}).encode()):
+        assert main.parse_journal_line(line) is None, line
+
+
+def test_parse_strips_bom():
+    # 記事本存成「UTF-8 (含 BOM)」時第一行前面會有 BOM
+    assert main.parse_journal_line("\ufeff頭獎,A001".encode()) == ("頭獎", "A001", "", "")
+    assert main.parse_journal_line("\ufeff# 註解".encode()) is None
+    assert main.parse_journal_line("\ufeff獎項,工號".encode()) is None
+
+
+def test_read_new_returns_only_appended_lines(tmp_path):
+    path = tmp_path / "抽獎紀錄.jsonl"
+    journal = main.DrawJournal(str(path))
+    assert journal.read_new() == []     # 紀錄檔還不存在
+    path.write_bytes("頭獎,A001\n".encode())
+    assert journal.read_new() == [("頭獎", "A001", "", "")]
+    assert journal.read_new() == []
+    with open(path, "ab") as f:
+        f.write("頭獎,A002\n# 註解\n二獎,A003\n".encode())
+    assert journal.read_new() == [("頭獎", "A002", "", ""), ("二獎", "A003", "", "")]
+    assert journal.offset == path.stat().st_size
+    assert journal.version_tag == f"-{journal.offset:x}"
+
+
+def test_read_new_keeps_partial_last_line(tmp_path):
+    path = tmp_path / "抽獎紀錄.jsonl"
+    path.write_bytes("頭獎,A001\n頭獎,A0".encode())
+    journal = main.DrawJournal(str(path))
+    assert journal.read_new() == [("頭獎", "A001", "", "")]
+    # 還沒換行的最後一行要等寫完 (或後面又加了一行) 才算數
+    with open(path, "ab") as f:
+        f.write(b"02")
+    assert journal.read_new() == []
+    with open(path, "ab") as f:
+        f.write("\n二獎,A003\n".encode())
+    assert journal.read_new() == [("頭獎", "A002", "", ""), ("二獎", "A003", "", "")]
+
+
+def test_read_new_detects_truncation(tmp_path):
+    path = tmp_path / "抽獎紀錄.jsonl"
+    path.write_bytes("頭獎,A001\n頭獎,A002\n".encode())
+    journal = main.DrawJournal(str(path))
+    assert len(journal.read_new()) == 2
+    path.write_bytes("頭獎,A001\n".encode())
+    assert journal.read_new() is None
+
+
+def test_read_new_detects_replaced_file(tmp_path):
+    path = tmp_path / "抽獎紀錄.jsonl"
+    path.write_bytes("頭獎,A001\n".encode())
+    journal = main.DrawJournal(str(path))
+    assert len(journal.read_new()) == 1
+    # 換成另一個比較長的檔案 (例如編輯器另存後改名蓋過去)：大小沒變小也要從頭重建
+    other = tmp_path / "新紀錄.jsonl"
+    other.write_bytes("二獎,B001\n二獎,B002\n二獎,B003\n".encode())
+    os.replace(other, path)
+    assert journal.read_new() is None
+
+
+def test_read_new_detects_deleted_file(tmp_path):
+    path = tmp_path / "抽獎紀錄.jsonl"
+    path.write_bytes("頭獎,A001\n".encode())
+    journal = main.DrawJournal(str(path))
+    assert len(journal.read_new()) == 1
+    path.unlink()
+    assert journal.read_new() is None
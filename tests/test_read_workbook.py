@@ -0,0 +1,203 @@
+"""內建 xlsx 讀取器 (read_workbook) 與 pandas.read_excel 的對照測試
+
+每個案例直接寫出工作表 XML，涵蓋 Excel 以外的程式常產生的寫法。
+"""
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bench  # noqa: E402
+import main  # noqa: E402
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("openpyxl")
+
+_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def make_xlsx(sheet_data, shared=None):
+    """把 <sheetData> 內容 (與選用的共用字串) 包成最小的 xlsx，回傳 bytes"""
+    overrides = ('<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                 '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>')
+    rels = f'<Relationship Id="rId1" Type="{_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+    if shared is not None:
+        overrides += '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+        rels += f'<Relationship Id="rId2" Type="{_REL}/sharedStrings" Target="sharedStrings.xml"/>'
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w") as zf:
+        zf.writestr("[Content_Types].xml",
+                    '<?xml version="1.0" encoding="UTF-8"?><Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                    f'<Default Extension="xml" ContentType="application/xml"/>{overrides}</Types>')
+        zf.writestr("_rels/.rels",
+                    f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="{_PKG}">'
+                    f'<Relationship Id="rId1" Type="{_REL}/officeDocument" Target="xl/workbook.xml"/></Relationships>')
+        zf.writestr("xl/workbook.xml",
+                    f'<?xml version="1.0" encoding="UTF-8"?><workbook xmlns="{_MAIN}" xmlns:r="{_REL}">'
+                    f'<sheets><sheet name="{main.WINNER_SHEET}" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        zf.writestr("xl/_rels/workbook.xml.rels",
+                    f'<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="{_PKG}">{rels}</Relationships>')
+        zf.writestr("xl/worksheets/sheet1.xml",
+                    f'<?xml version="1.0" encoding="UTF-8"?><worksheet xmlns="{_MAIN}"><sheetData>{sheet_data}</sheetData></worksheet>')
+        if shared is not None:
+            items = "".join(f"<si><t>{text}</t></si>" for text in shared)
+            zf.writestr("xl/sharedStrings.xml",
+                        f'<?xml version="1.0" encoding="UTF-8"?><sst xmlns="{_MAIN}" count="{len(shared)}" uniqueCount="{len(shared)}">{items}</sst>')
+    return out.getvalue()
+
+
+def pandas_rows(raw):
+    """pd.read_excel 讀到的列，整理成與 read_workbook 相同的形狀 (空白為 None，去掉每列尾端的空白)"""
+    frame = pd.read_excel(io.BytesIO(raw), sheet_name=main.WINNER_SHEET, header=None, dtype=object)
+    rows = []
+    for values in frame.itertuples(index=False):
+        row = [None if pd.isna(v) else v for v in values]
+        while row and row[-1] is None:
+            row.pop()
+        rows.append(row)
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def pandas_grouped(raw, col_award, col_name, col_dept, col_id):
+    """原版 get_data 的流程：pd.read_excel (工號以 str 轉換) 後 drop_duplicates + iterrows 分組"""
+    frame = pd.read_excel(io.BytesIO(raw), sheet_name=main.WINNER_SHEET, converters={col_id: str})
+    rows = [list(frame.columns)] + frame.values.tolist()
+    return bench._group_iterrows(rows, col_award, col_name, col_dept, col_id)[0]["data"]
+
+
+def builtin_rows(raw):
+    return main.read_workbook(raw, [main.WINNER_SHEET])[main.WINNER_SHEET]
+
+
+def typed(rows):
+    # 25 == 25.0 == True 在 Python 都相等，連型別一起比 (str() 之後的結果才會一樣)
+    return [[(type(v).__name__, v) for v in row] for row in rows]
+
+
+def inline_row(r, values):
+    """一列 inlineStr / 數值儲存格；None 的欄位不寫出"""
+    cells = ""
+    for col, value in zip("ABCD", values):
+        if isinstance(value, (int, float)):
+            cells += f'<c r="{col}{r}"><v>{value}</v></c>'
+        elif value is not None:
+            cells += f'<c r="{col}{r}" t="inlineStr"><is><t>{value}</t></is></c>'
+    return f'<row r="{r}">{cells}</row>'
+
+
+HEADER = '<row r="1"><c r="A1" t="inlineStr"><is><t>獎項</t></is></c><c r="B1" t="inlineStr"><is><t>工號</t></is></c><c r="C1" t="inlineStr"><is><t>姓名</t></is></c></row>'
+
+CASES = {
+    "inline_strings": (
+        HEADER + '<row r="2"><c r="A2" t="inlineStr"><is><t>頭獎</t></is></c>'
+                 '<c r="B2" t="inlineStr"><is><t>007</t></is></c>'
+                 '<c r="C2" t="inlineStr"><is><r><t>王</t></r><r><t>小明</t></r></is></c></row>',
+        None),
+    "shared_strings": (
+        '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c></row>'
+        '<row r="2"><c r="A2" t="s"><v>2</v></c><c r="B2"><v>7</v></c></row>',
+        ["獎項", "工號", "頭獎"]),
+    "sparse_rows_and_columns": (
+        HEADER + '<row r="4"><c r="C4" t="inlineStr"><is><t>只有姓名</t></is></c></row>'
+                 '<row r="7"><c r="A7" t="inlineStr"><is><t>二獎</t></is></c><c r="C7"><v>3</v></c></row>',
+        None),
+    "missing_r_attributes": (
+        HEADER + '<row><c t="inlineStr"><is><t>頭獎</t></is></c><c><v>12</v></c><c t="inlineStr"><is><t>李四</t></is></c></row>'
+                 '<row><c/><c><v>13</v></c></row>',
+        None),
+    "integer_and_float_ids": (
+        HEADER + '<row r="2"><c r="A2" t="inlineStr"><is><t>頭獎</t></is></c><c r="B2"><v>24</v></c></row>'
+                 '<row r="3"><c r="A3" t="inlineStr"><is><t>頭獎</t></is></c><c r="B3"><v>25.0</v></c></row>'
+                 '<row r="4"><c r="A4" t="inlineStr"><is><t>頭獎</t></is></c><c r="B4"><v>2.5</v></c></row>'
+                 '<row r="5"><c r="A5" t="inlineStr"><is><t>頭獎</t></is></c><c r="B5"><v>1E3</v></c></row>',
+        None),
+    "na_values": (
+        HEADER + '<row r="2"><c r="A2" t="inlineStr"><is><t>頭獎</t></is></c><c r="B2"><v>1</v></c><c r="C2" t="e"><v>#N/A</v></c></row>'
+                 '<row r="3"><c r="A3" t="inlineStr"><is><t>頭獎</t></is></c><c r="B3"><v>2</v></c><c r="C3" t="str"><v>#N/A</v></c></row>'
+                 '<row r="4"><c r="A4" t="inlineStr"><is><t>頭獎</t></is></c><c r="B4"><v>3</v></c><c r="C4" t="e"><v>#REF!</v></c></row>'
+                 '<row r="5"><c r="A5" t="inlineStr"><is><t>頭獎</t></is></c><c r="B5"><v>4</v></c><c r="C5" t="inlineStr"><is><t>N/A</t></is></c></row>',
+        None),
+    "formulas_without_cached_value": (
+        HEADER + '<row r="2"><c r="A2" t="inlineStr"><is><t>頭獎</t></is></c><c r="B2"><v>1</v></c><c r="C2"><f>VLOOKUP(B2,X!A:B,2,FALSE)</f></c></row>'
+                 '<row r="3"><c r="A3" t="inlineStr"><is><t>頭獎</t></is></c><c r="B3"><v>2</v></c><c r="C3" t="str"><f>B3&amp;""</f><v>2</v></c></row>'
+                 '<row r="4"><c r="A4" t="inlineStr"><is><t>頭獎</t></is></c><c r="B4"><v>3</v></c><c r="C4" t="str"><f>""</f><v></v></c></row>',
+        None),
+    "booleans": (
+        HEADER + '<row r="2"><c r="A2" t="inlineStr"><is><t>頭獎</t></is></c><c r="B2" t="b"><v>1</v></c><c r="C2" t="b"><v>0</v></c></row>',
+        None),
+    "empty_cells_and_trailing_rows": (
+        HEADER + '<row r="2"><c r="A2" t="inlineStr"><is><t></t></is></c><c r="B2"><v>5</v></c><c r="C2"/></row>'
+                 '<row r="3"/><row r="4"><c r="A4"/></row>',
+        None),
+    "blank_duplicate_and_float_ids": (
+        "".join(inline_row(r, values) for r, values in enumerate([
+            ("獎項", "工號", "姓名", "單位"),
+            ("頭獎", None, "甲", "A"),
+            ("頭獎", None, "乙", "B"),
+            ("二獎", 7, "丙", None),
+            ("二獎", 7, "丁", "D"),
+            (None, 8, "戊", "E"),
+            ("三獎", 24, "己", "F"),
+            ("三獎", 24.0, "庚", "G"),
+            ("三獎", 2.5, "辛", None),
+            ("三獎", "007", "壬", "H"),
+            ("三獎", 9, None, "I"),
+            ("三獎", 10, "  ", "J"),
+            ("三獎", "007", "癸", "K"),
+        ], start=1)),
+        None),
+}
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_read_workbook_matches_pandas(name):
+    sheet_data, shared = CASES[name]
+    raw = make_xlsx(sheet_data, shared)
+    assert typed(builtin_rows(raw)) == typed(pandas_rows(raw))
+
+
+def test_missing_shared_strings_part():
+    # 只有 inlineStr 的活頁簿可以沒有 sharedStrings.xml
+    raw = make_xlsx(CASES["inline_strings"][0])
+    assert "xl/sharedStrings.xml" not in zipfile.ZipFile(io.BytesIO(raw)).namelist()
+    assert builtin_rows(raw) == pandas_rows(raw) == [["獎項", "工號", "姓名"], ["頭獎", "007", "王小明"]]
+
+
+def test_signature_ignores_unrelated_shared_strings():
+    # 其他工作表新增字串 (例如新增得獎者) 不算變更；工作表用到的字串改了才重新解析
+    sheet_data = '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>2</v></c></row>'
+    signatures = {main.WINNER_SHEET: None}
+    main.read_workbook(make_xlsx(sheet_data, ["甲", "乙", "丙"]), [main.WINNER_SHEET], signatures)
+    result = main.read_workbook(make_xlsx(sheet_data, ["甲", "乙改", "丙", "丁"]), [main.WINNER_SHEET], signatures)
+    assert result[main.WINNER_SHEET] is main.SHEET_UNCHANGED
+    result = main.read_workbook(make_xlsx(sheet_data, ["甲", "乙", "丙改"]), [main.WINNER_SHEET], signatures)
+    assert result[main.WINNER_SHEET] == [["甲", "丙改"]]
+
+
+# 原版讀檔沒有指定 dtype，pandas 會把整欄只有空白與數字文字的姓名推斷成浮點數 ("2" 變成 "2.0")；
+# 內建讀取器照儲存格原樣保留文字，這是刻意的差異
+PANDAS_INFERRED_FLOATS = {"formulas_without_cached_value"}
+
+
+@pytest.mark.parametrize("name", [
+    pytest.param(name, marks=pytest.mark.xfail(strict=True, reason="pandas 的欄位型別推斷")) if name in PANDAS_INFERRED_FLOATS else name
+    for name in sorted(CASES)])
+def test_group_winners_matches_pandas(name):
+    # 依名單分組的結果要與原版 get_data 的 pandas 流程一致
+    sheet_data, shared = CASES[name]
+    raw = make_xlsx(sheet_data, shared)
+    args = ("獎項", "姓名", "單位", "工號")
+    result = main.group_winners(builtin_rows(raw), *args)
+    if "姓名" not in builtin_rows(raw)[0]:
+        assert "error" in result
+        return
+    data = {award: main.winner_objects(winners) for award, winners in result["data"].items()}
+    assert data == pandas_grouped(raw, *args)